@@ -3,47 +3,76 @@
 from __future__ import annotations
 
 import asyncio
+import logging
+import random
+import time
 import traceback
 import websockets
+from collections.abc import Callable
 from contextlib import suppress
 from functools import partial
 from typing import TYPE_CHECKING
 
-from homeassistant.components.binary_sensor import (
-    BinarySensorDeviceClass,
-    BinarySensorEntityDescription,
-)
-from homeassistant.components.select import SelectEntityDescription
-from homeassistant.components.sensor import (
-    SensorDeviceClass,
-    SensorEntityDescription,
-)
+from homeassistant.components.sensor import SensorDeviceClass
 from homeassistant.const import (
     CONF_HOST,
     CONF_PASSWORD,
     CONF_USERNAME,
     Platform,
-    PERCENTAGE,
-    UnitOfTemperature,
 )
-from homeassistant.helpers.entity_platform import async_get_platforms
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers import entity_registry
 from homeassistant.helpers.device_registry import async_get as async_get_device_registry
 from homeassistant.helpers.entity_registry import async_get, RegistryEntry
 from homeassistant.loader import async_get_loaded_integration
 
-from .const import DOMAIN, LOGGER, CONF_AREA
+from .const import (
+    AUTH_FAILURE_LIMIT,
+    DOMAIN,
+    LOGGER,
+    CONF_AREA,
+    CONF_COALESCE_ENUM,
+    CONF_COALESCE_HUMIDITY,
+    CONF_COALESCE_TEMPERATURE,
+    CONF_DEADBAND,
+    CONF_DEADBAND_ENTITIES,
+    CONF_DEADBAND_MAX_AGE,
+    CONF_EXCLUDED_SCREENS,
+    CONF_RECONNECT_MAX_DELAY,
+    CONF_REFRESH_INTERVAL,
+    CONF_WATCHDOG_TIMEOUT,
+    DEFAULT_DEADBAND_MAX_AGE,
+    DEFAULT_RECONNECT_MAX_DELAY,
+    DEFAULT_WATCHDOG_TIMEOUT,
+    RECONNECT_BASE_DELAY,
+    ENTITY_CREATION_WINDOW,
+)
+from .api import (
+    HarrieitherClientAuthenticationError,
+    HarrieitherClientCommunicationError,
+)
 from .data import HarreitherData
-from .brain import Connection, Entry
-from .binary_sensor import HarreitherBinarytSensor
-from .select import HarreitherInputSelect
+from .brain import Entry
+from .catalog import build_catalog, get_catalog_store, parse_catalog
+from .classification import DescriptorSignature, classify_signature
+from .connection import HarreitherConnection
+from .deadband import Deadband
+from .entity import HarreitherEntity
+from .handoff import async_take_parked_connection
+from .refresh import ScreenRefresher
 from .sensor import HarreitherEnumSensor, HarreitherSensor
+from .services import async_setup_services
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.typing import ConfigType
 
     from .data import HarreitherConfigEntry
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
 PLATFORMS: list[Platform] = [
     Platform.BINARY_SENSOR,
     Platform.SELECT,
@@ -51,16 +80,22 @@ PLATFORMS: list[Platform] = [
 ]
 
 
-async def async_add_entity(
+@callback
+def async_add_entity(
     hass: HomeAssistant,
     entry: HarreitherConfigEntry,
-    platform_dict: dict,
     dict_key,
     data_entry: Entry,
+    screens: dict,
 ) -> None:
-    """Add a single entity based on data_entry type."""
+    """Create a single entity based on data_entry type and queue it for adding.
+
+    Queued entities are handed to their platform by async_flush_pending_entities.
+    """
 
     screen_key = data_entry["_screen_key"]
+    if screen_key in entry.runtime_data.excluded_screens:
+        return
     entity_key = repr(dict_key)
     if entry.runtime_data.entities.get(entity_key):
         LOGGER.error(
@@ -68,11 +103,6 @@ async def async_add_entity(
             entity_key,
         )
         return
-    # Determine a user-friendly name with sensible fallbacks
-    # 1) use provided name
-    # 2) fallback to _vid_obj["text"] if available
-    # 3) fallback to the key
-    # 4) finally use "Unknown"
     _vid_obj = data_entry.get("_vid_obj")  # hard fail if it is not there
     if not _vid_obj:
         LOGGER.warning(
@@ -81,10 +111,19 @@ async def async_add_entity(
             data_entry,
         )
         return
+
+    signature = DescriptorSignature.from_entry(data_entry)
+    classification = classify_signature(signature)
+    if classification is None:
+        # Reported in aggregate by async_report_unmatched_signatures, later
+        # pushes of the key are ignored so that it is only counted once
+        entry.runtime_data.unmatched_signatures[signature] += 1
+        entry.runtime_data.dispatch[dict_key] = _async_dispatch_ignore
+        return
+
     # Prefix sensor names with screen title when available
     screen_prefix: str = ""
-    conn = entry.runtime_data.connection
-    screen = conn.entries.screens[screen_key]
+    screen = screens[screen_key]
     screen_prefix = screen.get("title").strip()
 
     # Build entity name: screen prefix + name (if exists) + text (if not "???")
@@ -97,220 +136,345 @@ async def async_add_entity(
         name_parts.append(text)
     entity_name = " / ".join(name_parts)
 
-    value = data_entry.get("value")
-
-    # Determine platforms, all of them have to be loaded already
-    sensor_platform = platform_dict[Platform.SENSOR]
-    binary_sensor_platform = platform_dict[Platform.BINARY_SENSOR]
-    input_select_platform = platform_dict[Platform.SELECT]
+    entity = classification.create_entity(entry, entity_key, entity_name, data_entry)
+    if entity is None:
+        return
+    LOGGER.debug("Detected %s entity: %s", classification.rule.name, entity_name)
+    entry.runtime_data.entities[entity_key] = entity
+    _queue_entity(entry, classification.rule.platform, entity)
 
-    # Organize detection as if/elif chain and log when nothing matches
-    created = False
 
-    if _vid_obj.get("unit") == "°C" and _vid_obj.get("type") == 12 and sensor_platform:
-        if not isinstance(value, (int, float)):
-            LOGGER.warning(
-                "Skipping temperature entity %s (key %s); value not numeric: %s",
-                entity_name,
-                entity_key,
-                value,
-            )
-            return
-        if isinstance(value, int):
-            data_entry["value"] = float(value)
-        # Temperature sensor
-        LOGGER.info("Detected temperature sensor entity: %s", entity_name)
-        entity_description = SensorEntityDescription(
-            key=entity_key,
-            name=f"{entity_name} ",
-            device_class=SensorDeviceClass.TEMPERATURE,
-            native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-        )
-        sensor = HarreitherSensor(
-            entry_id=entry.entry_id,
-            entity_key=entity_key,
-            entity_description=entity_description,
-            data_entry=data_entry,
+@callback
+def async_report_unmatched_signatures(entry: HarreitherConfigEntry) -> None:
+    """Log descriptor signatures no classification rule matched, then reset them."""
+    unmatched = entry.runtime_data.unmatched_signatures
+    if not unmatched:
+        return
+    LOGGER.info(
+        "No entity setup for %s entries with %s unsupported descriptor signatures",
+        unmatched.total(),
+        len(unmatched),
+    )
+    for signature, count in unmatched.most_common():
+        LOGGER.debug(
+            "Unsupported descriptor signature (%s entries): %s", count, signature
         )
-        entry.runtime_data.entities[entity_key] = sensor
+    unmatched.clear()
+
+
+def _queue_entity(
+    entry: HarreitherConfigEntry,
+    platform: Platform,
+    entity: HarreitherEntity,
+) -> None:
+    """Buffer a newly created entity until the next flush of its platform."""
+    entry.runtime_data.pending_entities.setdefault(platform, []).append(entity)
+
+
+@callback
+def async_schedule_flush_pending_entities(
+    hass: HomeAssistant,
+    entry: HarreitherConfigEntry,
+) -> None:
+    """Flush buffered entities once the creation window expires."""
+    runtime_data = entry.runtime_data
+    if not runtime_data.pending_entities or runtime_data.flush_unsub is not None:
+        return
+
+    async def _async_flush(_now) -> None:
+        runtime_data.flush_unsub = None
+        await async_flush_pending_entities(hass, entry)
+
+    runtime_data.flush_unsub = async_call_later(
+        hass, ENTITY_CREATION_WINDOW, _async_flush
+    )
+
+
+async def async_flush_pending_entities(
+    hass: HomeAssistant,
+    entry: HarreitherConfigEntry,
+) -> None:
+    """Add all buffered entities with a single async_add_entities call per platform."""
+    runtime_data = entry.runtime_data
+    if runtime_data.flush_unsub is not None:
+        runtime_data.flush_unsub()
+        runtime_data.flush_unsub = None
+
+    pending = runtime_data.pending_entities
+    if not pending:
+        return
+    runtime_data.pending_entities = {}
+    started = time.monotonic()
+
+    for platform, entities in pending.items():
+        LOGGER.info("Adding %s %s entities", len(entities), platform)
         try:
-            await sensor_platform.async_add_entities([sensor])
-        except:
-            pass
-        created = True
-
-    elif _vid_obj.get("unit") == "%" and sensor_platform:
-        # Humidity sensor
-        LOGGER.info("Detected humidity sensor entity: %s", entity_name)
-        humidity_description = SensorEntityDescription(
-            key=entity_key,
-            name=f"{entity_name}",
-            device_class=SensorDeviceClass.HUMIDITY,
-            native_unit_of_measurement=PERCENTAGE,
-        )
-        humidity_sensor = HarreitherSensor(
-            entry_id=entry.entry_id,
-            entity_key=entity_key,
-            entity_description=humidity_description,
-            data_entry=data_entry,
-        )
-        entry.runtime_data.entities[entity_key] = humidity_sensor
-        await sensor_platform.async_add_entities([humidity_sensor])
-        created = True
-
-    elif _vid_obj.get("type") == 15:
-        # Type 15: either binary sensor ( elements), enum sensor (>2 elements), or select (editable)
-        elements = _vid_obj.get("elements", [])
-
-        # Check if this should be a select (if main object has edit=True)
-        if data_entry.get("edit") is True:
-            LOGGER.info(
-                "Detected select entity with %s options: %s",
-                len(elements),
-                entity_name,
-            )
-            options = [
-                elem.get("text", f"Option {i}") if isinstance(elem, dict) else str(elem)
-                for i, elem in enumerate(elements)
-            ]
-            select_description = SelectEntityDescription(
-                key=entity_key,
-                name=f"{entity_name}",
-                options=options,
-            )
-            input_select = HarreitherInputSelect(
-                entry_id=entry.entry_id,
-                entity_key=entity_key,
-                entity_description=select_description,
-                data_entry=data_entry,
-                runtime_data=entry.runtime_data,
-            )
-            entry.runtime_data.entities[entity_key] = input_select
-            await input_select_platform.async_add_entities([input_select])
-            created = True
-        elif len(elements) == 2 and binary_sensor_platform:
-            LOGGER.info("Detected binary sensor entity: %s", entity_name)
-            entity_description = BinarySensorEntityDescription(
-                key=entity_key,
-                name=entity_name,
-                device_class=None,
-            )
-            binary_sensor = HarreitherBinarytSensor(
-                entry_id=entry.entry_id,
-                entity_key=entity_key,
-                entity_description=entity_description,
-                data_entry=data_entry,
-            )
-            entry.runtime_data.entities[entity_key] = binary_sensor
-            await binary_sensor_platform.async_add_entities([binary_sensor])
-            created = True
-        elif len(elements) > 2 and sensor_platform:
-            LOGGER.info(
-                "Detected enum sensor with %s options: %s",
-                len(elements),
-                entity_name,
-            )
-            options = [
-                elem.get("text", f"Option {i}") if isinstance(elem, dict) else str(elem)
-                for i, elem in enumerate(elements)
-            ]
-            enum_sensor = HarreitherEnumSensor(
-                entry_id=entry.entry_id,
-                entity_key=entity_key,
-                entity_name=f"{entity_name}",
-                options=options,
-                data_entry=data_entry,
-            )
-            entry.runtime_data.entities[entity_key] = enum_sensor
-            await sensor_platform.async_add_entities([enum_sensor])
-            created = True
-
-    if not created:
-        LOGGER.info(
-            "No entity setup for %s (key %s); _vid_obj=%s",
-            entity_name,
-            entity_key,
-            _vid_obj,
-        )
+            await runtime_data.platform_dict[platform].async_add_entities(entities)
+        except Exception:  # noqa: BLE001
+            LOGGER.exception("Failed to add %s entities", platform)
+            continue
+        runtime_data.unassigned_entities.extend(entities)
+    runtime_data.stats.add_phase("entity_creation", time.monotonic() - started)
 
-    # Set area and tags for created entity
-    if created:
-        area_id = entry.data.get(CONF_AREA)
-        # Pass entity object to get unique_id (stored in entry.runtime_data.entities)
-        created_entity = entry.runtime_data.entities.get(entity_key)
-        if created_entity:
-            await _set_entity_area_and_tags(
-                hass=hass,
-                entry=entry,
-                entity=created_entity,
-                area_id=area_id,
-            )
+    # During the initial sync, area and tags are assigned once it completes
+    conn = runtime_data.connection
+    if conn is None or conn.event_initial_traverse_screens_complete.is_set():
+        async_assign_area_and_tags(hass, entry)
 
 
-async def _set_entity_area_and_tags(
+@callback
+def async_assign_area_and_tags(
     hass: HomeAssistant,
     entry: HarreitherConfigEntry,
-    entity: object,
-    area_id: str | None,
 ) -> None:
-    """Set area and tags for a newly created entity."""
+    """Set area and tags for all newly added entities in one registry pass.
+
+    Entities whose area and tags are already correct cause no registry writes.
+    """
+    entities = entry.runtime_data.unassigned_entities
+    if not entities:
+        return
+    entry.runtime_data.unassigned_entities = []
+
+    area_id = entry.data.get(CONF_AREA) or None
     entity_registry_obj = async_get(hass)
     device_registry = async_get_device_registry(hass)
+    device_ids = set()
+    updated = 0
+
+    for entity in entities:
+        entity_entry = (
+            entity_registry_obj.async_get(entity.entity_id)
+            if entity.entity_id
+            else None
+        )
+        if not entity_entry:
+            LOGGER.warning("Could not find registry entry of entity %s", entity)
+            continue
+        if entity_entry.device_id:
+            device_ids.add(entity_entry.device_id)
 
-    # Get unique_id from entity (much faster than iterating all entities)
-    unique_id = getattr(entity, "unique_id", None)
-    if not unique_id:
-        LOGGER.warning("Entity %s has no unique_id", entity)
-        return
+        # Combine tags - keep existing tags and add harreither
+        existing_tags = set(entity_entry.tags) if entity_entry.tags else set()
+        if entity_entry.area_id == area_id and "harreither" in existing_tags:
+            continue
+        existing_tags.add("harreither")
 
-    # Look up entity by unique_id in the registry
-    entity_id = entity_registry_obj.async_get_entity_id(None, None, unique_id)
-    if not entity_id:
-        LOGGER.warning("Could not find entity with unique_id %s", unique_id)
-        return
+        # Update entity with area and tags
+        entity_registry_obj.async_update_entity(
+            entity_entry.entity_id,
+            area_id=area_id,
+            tags=existing_tags,
+        )
+        updated += 1
 
-    # Get the full entity entry object
-    entity_entry = entity_registry_obj.entities.get(entity_id)
-    if not entity_entry:
-        return
+    # If entities are linked to a device, update device area too
+    if area_id:
+        for device_id in device_ids:
+            device = device_registry.async_get(device_id)
+            if device and device.area_id != area_id:
+                device_registry.async_update_device(device.id, area_id=area_id)
+
+    LOGGER.debug("Assigned area and tags to %s of %s entities", updated, len(entities))
 
-    # Combine tags - keep existing tags and add harreither
-    existing_tags = set(entity_entry.tags) if entity_entry.tags else set()
-    existing_tags.add("harreither")
 
-    # Update entity with area and tags
-    entity_registry_obj.async_update_entity(
-        entity_entry.entity_id,
-        area_id=area_id if area_id else None,
-        tags=existing_tags,
+def async_mark_all_entries_unavailable(
+    entry: HarreitherConfigEntry,
+) -> None:
+    """Mark all tracked entities unavailable and reset connection for restart.
+
+    Entities and their registry entries are kept, so that a reconnect only has
+    to rebind them to the Entry objects of the new connection.
+    """
+    LOGGER.info("Marking all active entries unavailable for connection restart")
+
+    for entity in entry.runtime_data.entities.values():
+        entity.set_unavailable()
+
+    # Rebound entities have to write their first value to become available again
+    entry.runtime_data.last_values.clear()
+    async_cancel_held_values(entry)
+    async_cancel_coalesced_values(entry)
+
+    # Start tracking which keys the new connection reports
+    entry.runtime_data.session_keys.clear()
+
+    # Reset connection state
+    entry.runtime_data.connection = None
+
+
+@callback
+def async_cancel_held_values(entry: HarreitherConfigEntry) -> None:
+    """Drop values held back by the deadband and cancel their max-age writes."""
+    for unsub in entry.runtime_data.deadband_unsubs.values():
+        unsub()
+    entry.runtime_data.deadband_unsubs.clear()
+    entry.runtime_data.deadband_held.clear()
+
+
+@callback
+def async_cancel_coalesced_values(entry: HarreitherConfigEntry) -> None:
+    """Drop values waiting for their coalescing window and cancel the flushes."""
+    for unsub in entry.runtime_data.coalesce_unsubs.values():
+        unsub()
+    entry.runtime_data.coalesce_unsubs.clear()
+    entry.runtime_data.coalesce_pending.clear()
+
+
+def _parse_deadbands(entry: HarreitherConfigEntry) -> None:
+    """Store the global and per entity deadbands of the options."""
+    runtime_data = entry.runtime_data
+    try:
+        runtime_data.deadband = Deadband.parse(entry.options.get(CONF_DEADBAND))
+    except ValueError as err:
+        LOGGER.warning("Ignoring invalid deadband option: %s", err)
+    for entity_id, value in entry.options.get(CONF_DEADBAND_ENTITIES, {}).items():
+        try:
+            runtime_data.deadband_overrides[entity_id] = Deadband.parse(value)
+        except ValueError as err:
+            LOGGER.warning("Ignoring invalid deadband of %s: %s", entity_id, err)
+
+
+async def _async_sync_session(
+    hass: HomeAssistant,
+    entry: HarreitherConfigEntry,
+    conn_obj: HarreitherConnection,
+) -> None:
+    """Flush and reconcile entities as the initial controller sync progresses."""
+    stats = entry.runtime_data.stats
+    await conn_obj.event_initial_setup_complete.wait()
+    setup_completed = time.monotonic()
+    if conn_obj.session_started is not None:
+        stats.record_phase("initial_setup", setup_completed - conn_obj.session_started)
+    await async_flush_pending_entities(hass, entry)
+
+    catalog_device_id = entry.runtime_data.catalog_device_id
+    if catalog_device_id and catalog_device_id != conn_obj.device_id:
+        LOGGER.warning(
+            "Controller device id changed from %s to %s, dropping the catalog",
+            catalog_device_id,
+            conn_obj.device_id,
+        )
+        # Entities restored for the previous controller are removed right away,
+        # the ones this controller reported already were rebound to its entries
+        await conn_obj.updates.async_wait_idle()
+        await async_remove_stale_entries(hass, entry)
+        await entry.runtime_data.catalog_store.async_remove()
+        entry.runtime_data.catalog_device_id = None
+
+    await conn_obj.event_initial_traverse_screens_complete.wait()
+    stats.record_phase("traversal", time.monotonic() - setup_completed)
+    # Keys still queued for dispatch were reported and must not count as stale
+    await conn_obj.updates.async_wait_idle()
+    await async_flush_pending_entities(hass, entry)
+    async_assign_area_and_tags(hass, entry)
+    async_report_unmatched_signatures(entry)
+    if not conn_obj.traversal_completed:
+        # Keys the failed traversal did not reach yet are not gone from the
+        # controller, so nothing is removed and the stored catalog is kept
+        LOGGER.warning("Screen traversal did not complete, skipping reconciliation")
+        return
+    await async_remove_stale_entries(hass, entry)
+    await entry.runtime_data.catalog_store.async_save(
+        build_catalog(conn_obj, entry.runtime_data.entities)
     )
+    entry.runtime_data.catalog_device_id = conn_obj.device_id
 
-    # If entity is linked to a device, update device area too
-    if entity_entry.device_id:
-        device = device_registry.async_get(entity_entry.device_id)
-        if device and area_id:
-            device_registry.async_update_device(
-                device.id,
-                area_id=area_id,
-            )
+    if refresh_interval := entry.options.get(CONF_REFRESH_INTERVAL):
+        await ScreenRefresher(entry, conn_obj, refresh_interval).async_run()
 
 
-async def async_remove_all_entries(
+async def async_restore_catalog_entities(
     hass: HomeAssistant,
     entry: HarreitherConfigEntry,
 ) -> None:
-    """Remove all active entities and reset connection for restart.
+    """Create entities from the stored catalog before the controller connects.
 
-    This function should be called when we need to restart the connection.
-    It removes all tracked entities and clears the runtime data.
+    Restored entities stay unavailable until the live connection rebinds them.
     """
-    LOGGER.info("Removing all active entries for connection restart")
+    data = await entry.runtime_data.catalog_store.async_load()
+    if not data:
+        LOGGER.info("No stored catalog, entities will be created during traversal")
+        return
 
-    # Get registry to remove entities
+    screens, catalog_entries = parse_catalog(data)
+    excluded_unique_ids = set()
+    for key, data_entry in catalog_entries:
+        if data_entry["_screen_key"] in entry.runtime_data.excluded_screens:
+            excluded_unique_ids.add(f"{entry.entry_id}-{key!r}")
+            continue
+        async_add_entity(
+            hass,
+            entry,
+            key,
+            data_entry,
+            screens,
+        )
+        entity = entry.runtime_data.entities.get(repr(key))
+        if entity is not None:
+            entity.set_unavailable()
+            _async_register_entity_dispatch(entry, key, entity)
+
+    entry.runtime_data.catalog_device_id = data.get("device_id")
+    LOGGER.info(
+        "Restored %s entities from catalog of device %s",
+        len(entry.runtime_data.entities),
+        entry.runtime_data.catalog_device_id,
+    )
+    await async_flush_pending_entities(hass, entry)
+    async_remove_excluded_entries(hass, entry, excluded_unique_ids)
+
+
+@callback
+def async_remove_excluded_entries(
+    hass: HomeAssistant,
+    entry: HarreitherConfigEntry,
+    unique_ids: set[str],
+) -> None:
+    """Remove registry entries of entities on screens excluded in the options."""
+    if not unique_ids:
+        return
     registry = entity_registry.async_get(hass)
+    removed = 0
+    for registry_entry in entity_registry.async_entries_for_config_entry(
+        registry, entry.entry_id
+    ):
+        if registry_entry.unique_id in unique_ids:
+            registry.async_remove(registry_entry.entity_id)
+            removed += 1
+    LOGGER.info("Removed %s entities on excluded screens", removed)
 
-    # Remove all entities tracked in runtime data
-    for entity_key, entity in entry.runtime_data.entities.items():
+
+async def async_remove_stale_entries(
+    hass: HomeAssistant,
+    entry: HarreitherConfigEntry,
+) -> None:
+    """Remove entities the controller no longer reports.
+
+    Only keys that disappeared since the previous connection are touched.
+    """
+    entities = entry.runtime_data.entities
+    stale_keys = [
+        entity_key
+        for entity_key in entities
+        if entity_key not in entry.runtime_data.session_keys
+    ]
+    if not stale_keys:
+        return
+
+    LOGGER.info(
+        "Removing %s entities no longer reported by controller", len(stale_keys)
+    )
+    stale_key_set = set(stale_keys)
+    entry.runtime_data.dispatch = {
+        key: handler
+        for key, handler in entry.runtime_data.dispatch.items()
+        if repr(key) not in stale_key_set
+    }
+    registry = entity_registry.async_get(hass)
+    for entity_key in stale_keys:
+        entity = entities.pop(entity_key)
+        entry.runtime_data.last_values.pop(entity_key, None)
         try:
             entity_id = entity.entity_id
             if entity_id and entity_id in registry.entities:
@@ -323,14 +487,6 @@ async def async_remove_all_entries(
                 e,
             )
 
-    # Clear entities dictionary
-    entry.runtime_data.entities.clear()
-
-    # Reset connection state
-    entry.runtime_data.connection = None
-
-    LOGGER.info("All active entries have been removed")
-
 
 def get_url_from_host(host: str) -> str:
     """Return websocket URL built from the provided host string."""
@@ -347,40 +503,275 @@ async def _async_notify_update_callback(
     new: bool,
 ) -> None:
     """Handle update callbacks from the client."""
-    if key == (317, 1, None):  # this is system time 1-second ping
-        return
-    if key[0] == 318:  # this is "a problem" indicator
-        LOGGER.warning("Received 'a problem' indicator update, ignoring")
-        return
+    dispatch = entry.runtime_data.dispatch
+    handler = dispatch.get(key)
+    if handler is None:
+        handler = dispatch[key] = _classify_key(key)
+    handler(hass, entry, key, entry_data, new)
 
+
+def _classify_key(key: tuple) -> Callable:
+    """Return the dispatch handler for a key without an entity yet."""
+    if key == (317, 1, None):  # system time 1-second ping, only feeds the watchdog
+        return _async_dispatch_ignore
+    if key[0] == 318:  # this is "a problem" indicator
+        return _async_dispatch_problem
     if key[1] == 0:  # this is jsut a break/back button
+        return _async_dispatch_ignore
+    return _async_dispatch_pending_creation
+
+
+@callback
+def _async_dispatch_ignore(
+    hass: HomeAssistant,
+    entry: HarreitherConfigEntry,
+    key: tuple,
+    entry_data: Entry,
+    new: bool,
+) -> None:
+    """Ignore keys that never map to an entity."""
+
+
+@callback
+def _async_dispatch_problem(
+    hass: HomeAssistant,
+    entry: HarreitherConfigEntry,
+    key: tuple,
+    entry_data: Entry,
+    new: bool,
+) -> None:
+    """Handle the 'a problem' indicator."""
+    LOGGER.warning("Received 'a problem' indicator update, ignoring")
+
+
+@callback
+def _async_dispatch_pending_creation(
+    hass: HomeAssistant,
+    entry: HarreitherConfigEntry,
+    key: tuple,
+    entry_data: Entry,
+    new: bool,
+) -> None:
+    """Create the entity of a new key and hand the value over to it."""
+    if entry_data.get("_screen_key") in entry.runtime_data.excluded_screens:
+        entry.runtime_data.flight_recorder.record("excluded", key)
+        entry.runtime_data.dispatch[key] = _async_dispatch_ignore
         return
-    # If this is a new entity, add it dynamically
-    if new:
-        await async_add_entity(
-            hass, entry, entry.runtime_data.platform_dict, key, entry_data
-        )
 
-    value = entry_data.get("value")
-    screen_key = entry_data["_screen_key"]
     entity_key = repr(key)
-
-    # Look up entity directly in the entities dict
-    entity = entry.runtime_data.entities.get(entity_key)
-    if entity:
-        entity.update_state(value)
-        LOGGER.info(
-            "Updated entity %s with value: %s",
-            entity_key,
-            value,
-        )
-    else:
+    if not new:
         LOGGER.debug(
             "Entity %s not found in entities dict, value: %s (type: %s)",
             entity_key,
-            value,
-            type(value),
+            entry_data.get("value"),
+            type(entry_data.get("value")),
         )
+        return
+
+    entry.runtime_data.session_keys.add(entity_key)
+    async_add_entity(
+        hass,
+        entry,
+        key,
+        entry_data,
+        entry.runtime_data.connection.entries.screens,
+    )
+    entity = entry.runtime_data.entities.get(entity_key)
+    if entity is None:
+        entry.runtime_data.flight_recorder.record("unsupported", key)
+        return
+    entry.runtime_data.flight_recorder.record("created", key)
+    async_schedule_flush_pending_entities(hass, entry)
+    _async_register_entity_dispatch(entry, key, entity)(
+        hass, entry, key, entry_data, False
+    )
+
+
+@callback
+def _async_register_entity_dispatch(
+    entry: HarreitherConfigEntry,
+    key: tuple,
+    entity: HarreitherEntity,
+) -> Callable:
+    """Route updates of key straight to its entity and return the handler."""
+    handler = partial(
+        _async_dispatch_entity_update, repr(key), entity, _get_update_class(entity)
+    )
+    entry.runtime_data.dispatch[key] = handler
+    return handler
+
+
+@callback
+def _async_dispatch_entity_update(
+    entity_key: str,
+    entity: HarreitherEntity,
+    update_class: str | None,
+    hass: HomeAssistant,
+    entry: HarreitherConfigEntry,
+    key: tuple,
+    entry_data: Entry,
+    new: bool,
+) -> None:
+    """Update an existing entity, rebinding it when the key is reported anew."""
+    if new:
+        entry.runtime_data.session_keys.add(entity_key)
+        entity.rebind_entry(entry_data)
+
+    value = entry_data.get("value")
+    if update_class and entry.options.get(update_class):
+        _async_coalesce_value(hass, entry, update_class, entity_key, value)
+        return
+    _async_write_value(hass, entry, entity_key, entity, value)
+
+
+def _get_update_class(entity: HarreitherEntity) -> str | None:
+    """Return the coalescing option that applies to an entity, if any."""
+    if isinstance(entity, HarreitherEnumSensor):
+        return CONF_COALESCE_ENUM
+    if isinstance(entity, HarreitherSensor):
+        device_class = entity.entity_description.device_class
+        if device_class == SensorDeviceClass.TEMPERATURE:
+            return CONF_COALESCE_TEMPERATURE
+        if device_class == SensorDeviceClass.HUMIDITY:
+            return CONF_COALESCE_HUMIDITY
+    return None
+
+
+def _get_deadband(
+    entry: HarreitherConfigEntry,
+    entity: HarreitherEntity,
+) -> Deadband | None:
+    """Return the deadband that applies to an entity, if any."""
+    if not isinstance(entity, HarreitherSensor):
+        return None
+    overrides = entry.runtime_data.deadband_overrides
+    if entity.entity_id in overrides:
+        return overrides[entity.entity_id]
+    return entry.runtime_data.deadband
+
+
+@callback
+def _async_write_value(
+    hass: HomeAssistant,
+    entry: HarreitherConfigEntry,
+    entity_key: str,
+    entity: HarreitherEntity,
+    value,
+    force: bool = False,
+) -> None:
+    """Write a value to an entity unless it is unchanged or within its deadband."""
+    runtime_data = entry.runtime_data
+    # Drop repeat pushes of an unchanged value before they reach HA
+    last_values = runtime_data.last_values
+    if entity_key in last_values and last_values[entity_key] == value:
+        # A held value that bounced back must not be written when it expires
+        if (unsub := runtime_data.deadband_unsubs.pop(entity_key, None)) is not None:
+            unsub()
+            runtime_data.deadband_held.pop(entity_key, None)
+        runtime_data.suppressed_writes += 1
+        runtime_data.flight_recorder.record("unchanged", entity_key)
+        return
+
+    last_value = last_values.get(entity_key)
+    if (
+        not force
+        and isinstance(last_value, (int, float))
+        and isinstance(value, (int, float))
+        and (deadband := _get_deadband(entry, entity))
+        and deadband.holds(last_value, value)
+    ):
+        runtime_data.flight_recorder.record("held", entity_key, value)
+        _async_hold_value(hass, entry, entity_key, entity, value)
+        return
+
+    # Entities not added yet and rejected values are not cached, so that the
+    # next push of the same value is written instead of dropped as unchanged
+    if not entity.update_state(value):
+        runtime_data.flight_recorder.record("not_written", entity_key, value)
+        return
+
+    if (unsub := runtime_data.deadband_unsubs.pop(entity_key, None)) is not None:
+        unsub()
+        runtime_data.deadband_held.pop(entity_key, None)
+    last_values[entity_key] = value
+    data_entry = entity._data_entry
+    runtime_data.screen_activity[data_entry["_screen_key"]] = time.monotonic()
+    key = (data_entry.get("VID"), data_entry["detail"], data_entry.get("objID"))
+    if (stats := runtime_data.key_stats.get(key)) is not None:
+        stats.written += 1
+    runtime_data.flight_recorder.record("written", entity_key, value)
+    if LOGGER.isEnabledFor(logging.DEBUG) and runtime_data.update_log_limiter.allow():
+        LOGGER.debug("Updated entity %s with value: %s", entity_key, value)
+
+
+@callback
+def _async_hold_value(
+    hass: HomeAssistant,
+    entry: HarreitherConfigEntry,
+    entity_key: str,
+    entity: HarreitherEntity,
+    value,
+) -> None:
+    """Hold back a value within the deadband, writing it once it is too old."""
+    runtime_data = entry.runtime_data
+    runtime_data.deadband_suppressed += 1
+    runtime_data.deadband_held[entity_key] = value
+    if entity_key in runtime_data.deadband_unsubs:
+        return
+
+    @callback
+    def _async_write_held(_now) -> None:
+        runtime_data.deadband_unsubs.pop(entity_key, None)
+        if entity_key in runtime_data.deadband_held:
+            held_value = runtime_data.deadband_held.pop(entity_key)
+            _async_write_value(hass, entry, entity_key, entity, held_value, force=True)
+
+    runtime_data.deadband_unsubs[entity_key] = async_call_later(
+        hass,
+        entry.options.get(CONF_DEADBAND_MAX_AGE, DEFAULT_DEADBAND_MAX_AGE),
+        _async_write_held,
+    )
+
+
+@callback
+def _async_coalesce_value(
+    hass: HomeAssistant,
+    entry: HarreitherConfigEntry,
+    update_class: str,
+    entity_key: str,
+    value,
+) -> None:
+    """Keep only the latest value per key until the class window expires."""
+    runtime_data = entry.runtime_data
+    runtime_data.flight_recorder.record("coalesced", entity_key, value)
+    runtime_data.coalesce_pending.setdefault(update_class, {})[entity_key] = value
+    if update_class in runtime_data.coalesce_unsubs:
+        return
+
+    @callback
+    def _async_flush(_now) -> None:
+        runtime_data.coalesce_unsubs.pop(update_class, None)
+        pending = runtime_data.coalesce_pending.pop(update_class, {})
+        for pending_key, pending_value in pending.items():
+            entity = runtime_data.entities.get(pending_key)
+            if entity:
+                _async_write_value(hass, entry, pending_key, entity, pending_value)
+
+    runtime_data.coalesce_unsubs[update_class] = async_call_later(
+        hass, entry.options[update_class], _async_flush
+    )
+
+
+def _reconnect_delay(retry_count: int, max_delay: float) -> float:
+    """Return the delay before reconnection attempt retry_count + 1.
+
+    The first retry is immediate. After that the delay doubles per failure up
+    to max_delay, and half of it is random so that restarts do not line up.
+    """
+    if retry_count <= 1:
+        return 0
+    delay = min(max_delay, RECONNECT_BASE_DELAY * 2 ** (retry_count - 2))
+    return delay / 2 + random.uniform(0, delay / 2)
 
 
 async def _connection_loop(
@@ -390,59 +781,120 @@ async def _connection_loop(
     """Run the connection loop with reconnection logic."""
     LOGGER.info("Starting connection loop")
     ws_url = get_url_from_host(entry.data[CONF_HOST])
+    max_delay = entry.options.get(CONF_RECONNECT_MAX_DELAY, DEFAULT_RECONNECT_MAX_DELAY)
     retry_count = 0
-    backoff_delays = [0, 5, 10, 60]  # immediate, 5s, 10s, 1 minute
+    auth_failures = 0
 
     while True:
+        conn_obj: HarreitherConnection | None = None
         try:
             # Calculate backoff delay
-            if retry_count > 0:
-                delay_index = min(retry_count - 1, len(backoff_delays) - 1)
-                delay = backoff_delays[delay_index]
-                if delay > 0:
-                    LOGGER.info(
-                        "Waiting %s seconds before reconnection attempt %s",
-                        delay,
-                        retry_count + 1,
-                    )
-                    await asyncio.sleep(delay)
+            delay = _reconnect_delay(retry_count, max_delay)
+            if delay > 0:
+                LOGGER.info(
+                    "Waiting %.1f seconds before reconnection attempt %s",
+                    delay,
+                    retry_count + 1,
+                )
+                await asyncio.sleep(delay)
 
-            # Remove all active entries before reconnecting
-            await async_remove_all_entries(hass, entry)
+            # Keep entities around, they get rebound by key once the controller reports them
+            async_mark_all_entries_unavailable(entry)
 
-            conn_obj = Connection(traverse_screens_on_init=True)
+            # A connection the config flow just validated skips the handshake
+            conn_obj = async_take_parked_connection(
+                hass, ws_url, entry.data[CONF_USERNAME]
+            )
+            reused = conn_obj is not None
+            if not reused:
+                conn_obj = HarreitherConnection(traverse_screens_on_init=True)
+            conn_obj.watchdog_timeout = entry.options.get(
+                CONF_WATCHDOG_TIMEOUT, DEFAULT_WATCHDOG_TIMEOUT
+            )
+            conn_obj.excluded_screens = entry.runtime_data.excluded_screens
+            # The config flow measured the handshake of a validated connection
+            stats = entry.runtime_data.stats
+            stats.phases = dict(conn_obj.stats.phases) if reused else {}
+            conn_obj.stats = stats
+            conn_obj.key_stats = entry.runtime_data.key_stats
+            conn_obj.flight_recorder = entry.runtime_data.flight_recorder
             conn_obj.add_async_notify_update_callback(
                 partial(_async_notify_update_callback, hass, entry)
             )
+            sync_task = hass.async_create_background_task(
+                _async_sync_session(hass, entry, conn_obj),
+                name="_async_sync_session",
+            )
             try:
-                await conn_obj.async_websocket_connect(ws_url, proxy_url=None)
-
-                entry.runtime_data.connection = conn_obj
-
-                await conn_obj.establish_secure_connection()
-                await conn_obj.enqueue_authentication_flow(
-                    username=entry.data[CONF_USERNAME],
-                    password=entry.data[CONF_PASSWORD],
-                )
-
-                retry_count = 0  # Reset retry count on successful connection
+                if reused:
+                    LOGGER.info("Starting session on the validated connection")
+                    entry.runtime_data.connection = conn_obj
+                    await conn_obj.async_start_session()
+                else:
+                    try:
+                        await conn_obj.async_websocket_connect(ws_url, proxy_url=None)
+                        entry.runtime_data.connection = conn_obj
+                        await conn_obj.establish_secure_connection()
+                    except Exception as err:  # noqa: BLE001
+                        raise HarrieitherClientCommunicationError(
+                            f"Failed to connect to {ws_url}: {err}"
+                        ) from err
+
+                    await conn_obj.async_authenticate(
+                        username=entry.data[CONF_USERNAME],
+                        password=entry.data[CONF_PASSWORD],
+                    )
                 try:
                     await conn_obj.messages_process()
                 except asyncio.CancelledError:
                     LOGGER.info("Connection loop cancelled, closing websocket")
                     raise
             finally:
+                if not sync_task.done():
+                    sync_task.cancel()
                 await conn_obj.async_close()
         except (asyncio.CancelledError, websockets.exceptions.ConnectionClosedOK):
             # Re-raise cancellation to properly exit the task
             LOGGER.info("Connection task cancelled")
             raise
+        except HarrieitherClientAuthenticationError as err:
+            entry.runtime_data.stats.record_reconnect(err)
+            retry_count += 1
+            auth_failures += 1
+            if auth_failures >= AUTH_FAILURE_LIMIT:
+                # Retrying cannot help, wait for the user to update the credentials
+                LOGGER.error(
+                    "Controller denied the login %s times in a row, "
+                    "stopping reconnection until the credentials are updated",
+                    auth_failures,
+                )
+                entry.async_start_reauth(hass)
+                return
+            LOGGER.warning(
+                "Controller denied the login (%s of %s attempts)",
+                auth_failures,
+                AUTH_FAILURE_LIMIT,
+            )
         except Exception as e:  # noqa: BLE001
+            entry.runtime_data.stats.record_reconnect(e)
+            if conn_obj is not None and conn_obj.authenticated:
+                auth_failures = 0
+                # Only a session that stayed up resets the backoff, a controller
+                # dropping every session right after the login must not be hammered
+                if time.monotonic() - conn_obj.session_started >= max_delay:
+                    retry_count = 0
             retry_count += 1
-            LOGGER.info("Error during connection, restarting)")
-            LOGGER.info("Exception details: %s", e, exc_info=True)
-            # Continue to retry with backoff
-            continue
+            if retry_count == 1:
+                LOGGER.warning("Connection to controller lost: %s", e)
+            else:
+                LOGGER.info("Reconnection attempt %s failed: %s", retry_count, e)
+            LOGGER.debug("Exception details: %s", e, exc_info=True)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the integration services."""
+    async_setup_services(hass)
+    return True
 
 
 # https://developers.home-assistant.io/docs/config_entries_index/#setting-up-an-entry
@@ -453,15 +905,21 @@ async def async_setup_entry(
     """Set up this integration using UI."""
     entry.runtime_data = HarreitherData(
         integration=async_get_loaded_integration(hass, entry.domain),
+        excluded_screens={
+            (screen_id, obj_id)
+            for screen_id, obj_id in entry.options.get(CONF_EXCLUDED_SCREENS, [])
+        },
     )
 
     # make sure platform_dict is setup before we start the loop - as (in theory) we could be immediately adding new entries
+    # Each platform stores the EntityPlatform of this entry in platform_dict
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-    # Get platforms and store them in runtime data for later use
-    platforms = async_get_platforms(hass, DOMAIN)
-    entry.runtime_data.platform_dict = {
-        platform.domain: platform for platform in platforms
-    }
+
+    _parse_deadbands(entry)
+
+    # Create entities known from the previous run right away
+    entry.runtime_data.catalog_store = get_catalog_store(hass, entry.entry_id)
+    await async_restore_catalog_entities(hass, entry)
 
     # Start the connection task as a background task
     task = hass.async_create_background_task(
@@ -505,9 +963,23 @@ async def async_unload_entry(
             except asyncio.CancelledError:
                 pass
 
+    if entry.runtime_data.flush_unsub is not None:
+        entry.runtime_data.flush_unsub()
+        entry.runtime_data.flush_unsub = None
+    async_cancel_coalesced_values(entry)
+    async_cancel_held_values(entry)
+
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
 
+async def async_remove_entry(
+    hass: HomeAssistant,
+    entry: HarreitherConfigEntry,
+) -> None:
+    """Remove the stored catalog when the entry is deleted."""
+    await get_catalog_store(hass, entry.entry_id).async_remove()
+
+
 async def async_reload_entry(
     hass: HomeAssistant,
     entry: HarreitherConfigEntry,
@@ -9,12 +9,15 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntity,
     BinarySensorEntityDescription,
 )
+from homeassistant.const import STATE_OFF, STATE_ON, Platform
+from homeassistant.helpers.entity_platform import async_get_current_platform
 
 from .const import LOGGER
 from .data import HarreitherConfigEntry
+from .entity import HarreitherEntity
 
 if TYPE_CHECKING:
-    from homeassistant.core import HomeAssistant
+    from homeassistant.core import HomeAssistant, State
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 
@@ -24,11 +27,13 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the binary_sensor platform."""
-    # Entity creation is now handled in __init__.py after initialization completes
-    pass
+    # Entity creation is handled in __init__.py as the controller reports entries,
+    # through the platform of this config entry
+    platform = async_get_current_platform()
+    entry.runtime_data.platform_dict[Platform.BINARY_SENSOR] = platform
 
 
-class HarreitherBinarytSensor(BinarySensorEntity):
+class HarreitherBinarytSensor(HarreitherEntity, BinarySensorEntity):
     """Harreither binary_sensor class."""
 
     def __init__(
@@ -49,7 +54,14 @@ class HarreitherBinarytSensor(BinarySensorEntity):
         """Return true if the binary_sensor is on."""
         return self._attr_is_on
 
-    def update_state(self, value: int) -> None:
-        """Update binary sensor state and write to Home Assistant."""
+    def restore_last_state(self, last_state: State) -> bool:
+        """Restore the last on/off state."""
+        if last_state.state not in (STATE_ON, STATE_OFF):
+            return False
+        self._attr_is_on = last_state.state == STATE_ON
+        return True
+
+    def update_state(self, value: int) -> bool:
+        """Update binary sensor state, return whether it was written."""
         self._attr_is_on = value == 1
-        self.async_write_ha_state()
+        return self._async_write_state()
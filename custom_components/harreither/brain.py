@@ -7,10 +7,22 @@ try:
     # Use local copy first to ease development
     from .harreither_brain_client.connection import Connection
     from .harreither_brain_client.entries import Entry, Entries
+    from .harreither_brain_client.message import MC_AUTO, MessageSend
     from .harreither_brain_client.receive import ReceiveData
+    from .harreither_brain_client.type_int import TypeInt
 except ImportError:  # pragma: no cover - fallback for packaged installs
     from harreither_brain_client.connection import Connection
     from harreither_brain_client.entries import Entry, Entries
+    from harreither_brain_client.message import MC_AUTO, MessageSend
     from harreither_brain_client.receive import ReceiveData
+    from harreither_brain_client.type_int import TypeInt
 
-__all__ = ["Connection", "Entry", "Entries", "ReceiveData"]
+__all__ = [
+    "MC_AUTO",
+    "Connection",
+    "Entry",
+    "Entries",
+    "MessageSend",
+    "ReceiveData",
+    "TypeInt",
+]
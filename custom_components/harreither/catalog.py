@@ -0,0 +1,77 @@
+"""Persistent screen/vid catalog for harreither.
+
+The catalog remembers which entities the controller exposed during the last
+completed screen traversal, so entities can be created right at startup instead
+of waiting for the traversal of all screens.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.helpers.storage import Store
+
+from .brain import Entry
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .brain import Connection
+
+CATALOG_STORAGE_VERSION = 1
+
+# Entry fields needed to classify and name an entity
+CATALOG_ENTRY_FIELDS = ("VID", "detail", "objID", "name", "edit", "value", "_vid_obj")
+
+
+def get_catalog_store(hass: HomeAssistant, entry_id: str) -> Store:
+    """Return the storage helper holding the catalog of a config entry."""
+    return Store(hass, CATALOG_STORAGE_VERSION, f"{DOMAIN}.catalog.{entry_id}")
+
+
+def build_catalog(conn_obj: Connection, entities: dict) -> dict[str, Any]:
+    """Build a JSON-serializable catalog from the entities bound to conn_obj."""
+    screens = {}
+    catalog_entries = []
+    for entity in entities.values():
+        data_entry = entity._data_entry
+        if data_entry is None:
+            continue
+        screen_key = data_entry["_screen_key"]
+        screen = conn_obj.entries.screens.get(screen_key)
+        if screen is None:
+            continue
+        screens[screen_key] = screen.get("title", "")
+        catalog_entry = {
+            field: data_entry[field]
+            for field in CATALOG_ENTRY_FIELDS
+            if field in data_entry
+        }
+        catalog_entry["_screen_key"] = list(screen_key)
+        catalog_entries.append(catalog_entry)
+
+    return {
+        "device_id": conn_obj.device_id,
+        "screens": [
+            [screen_id, obj_id, title] for (screen_id, obj_id), title in screens.items()
+        ],
+        "entries": catalog_entries,
+    }
+
+
+def parse_catalog(
+    data: dict[str, Any],
+) -> tuple[dict[tuple, dict], list[tuple[tuple, Entry]]]:
+    """Return screens and (key, Entry) pairs from stored catalog data."""
+    screens = {
+        (screen_id, obj_id): {"screenID": screen_id, "objID": obj_id, "title": title}
+        for screen_id, obj_id, title in data.get("screens", [])
+    }
+    entries = []
+    for catalog_entry in data.get("entries", []):
+        data_entry = Entry(catalog_entry)
+        data_entry["_screen_key"] = tuple(catalog_entry["_screen_key"])
+        key = (data_entry.get("VID"), data_entry["detail"], data_entry.get("objID"))
+        entries.append((key, data_entry))
+    return screens, entries
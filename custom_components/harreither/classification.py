@@ -0,0 +1,256 @@
+"""Entity classification for harreither _vid_obj descriptors.
+
+Descriptors are reduced to a DescriptorSignature and matched against
+ENTITY_RULES in order. The first matching rule decides the platform and the
+factory building the entity. The result is cached per signature, so entries
+sharing a descriptor are classified only once.
+
+Support for further descriptor kinds (other units, editable numerics, ...) is
+added by appending an EntityRule, either to ENTITY_RULES directly or through
+register_entity_rule.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.binary_sensor import BinarySensorEntityDescription
+from homeassistant.components.select import SelectEntityDescription
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntityDescription,
+)
+from homeassistant.const import PERCENTAGE, Platform, UnitOfTemperature
+
+from .binary_sensor import HarreitherBinarytSensor
+from .const import LOGGER
+from .select import HarreitherInputSelect
+from .sensor import HarreitherEnumSensor, HarreitherSensor
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from .brain import Entry
+    from .data import HarreitherConfigEntry
+    from .entity import HarreitherEntity
+
+
+@dataclass(frozen=True, slots=True)
+class DescriptorSignature:
+    """The parts of an entry that decide which entity it becomes."""
+
+    type: Any
+    unit: str | None
+    options: tuple[str, ...]
+    edit: bool
+
+    @classmethod
+    def from_entry(cls, data_entry: Entry) -> DescriptorSignature:
+        """Return the signature of an entry with a _vid_obj."""
+        _vid_obj = data_entry["_vid_obj"]
+        return cls(
+            type=_vid_obj.get("type"),
+            unit=_vid_obj.get("unit"),
+            options=tuple(
+                elem.get("text", f"Option {i}") if isinstance(elem, dict) else str(elem)
+                for i, elem in enumerate(_vid_obj.get("elements", []))
+            ),
+            edit=data_entry.get("edit") is True,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class EntityRule:
+    """Map descriptors accepted by matches to an entity factory."""
+
+    name: str
+    platform: Platform
+    matches: Callable[[DescriptorSignature], bool]
+    factory: Callable[..., HarreitherEntity | None]
+    # Builds the description template of a signature, key and name are filled per entity
+    describe: Callable[[DescriptorSignature], Any] | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class Classification:
+    """Cached classification result for a descriptor signature."""
+
+    rule: EntityRule
+    signature: DescriptorSignature
+    description: Any = None
+
+    def create_entity(
+        self,
+        entry: HarreitherConfigEntry,
+        entity_key: str,
+        entity_name: str,
+        data_entry: Entry,
+    ) -> HarreitherEntity | None:
+        """Build the entity for one entry, or None if its value is unusable."""
+        return self.rule.factory(self, entry, entity_key, entity_name, data_entry)
+
+
+def _create_temperature_sensor(
+    classification: Classification,
+    entry: HarreitherConfigEntry,
+    entity_key: str,
+    entity_name: str,
+    data_entry: Entry,
+) -> HarreitherEntity | None:
+    """Create a temperature sensor, requiring a numeric value."""
+    value = data_entry.get("value")
+    if not isinstance(value, (int, float)):
+        LOGGER.warning(
+            "Skipping temperature entity %s (key %s); value not numeric: %s",
+            entity_name,
+            entity_key,
+            value,
+        )
+        return None
+    if isinstance(value, int):
+        data_entry["value"] = float(value)
+    return _create_sensor(
+        classification, entry, entity_key, f"{entity_name} ", data_entry
+    )
+
+
+def _create_sensor(
+    classification: Classification,
+    entry: HarreitherConfigEntry,
+    entity_key: str,
+    entity_name: str,
+    data_entry: Entry,
+) -> HarreitherEntity:
+    """Create a plain sensor from the rule's description template."""
+    return HarreitherSensor(
+        entry_id=entry.entry_id,
+        entity_key=entity_key,
+        entity_description=replace(
+            classification.description, key=entity_key, name=entity_name
+        ),
+        data_entry=data_entry,
+    )
+
+
+def _create_select(
+    classification: Classification,
+    entry: HarreitherConfigEntry,
+    entity_key: str,
+    entity_name: str,
+    data_entry: Entry,
+) -> HarreitherEntity:
+    """Create a select for an editable element list."""
+    return HarreitherInputSelect(
+        entry_id=entry.entry_id,
+        entity_key=entity_key,
+        entity_description=replace(
+            classification.description, key=entity_key, name=entity_name
+        ),
+        data_entry=data_entry,
+        runtime_data=entry.runtime_data,
+    )
+
+
+def _create_binary_sensor(
+    classification: Classification,
+    entry: HarreitherConfigEntry,
+    entity_key: str,
+    entity_name: str,
+    data_entry: Entry,
+) -> HarreitherEntity:
+    """Create a binary sensor for a two element list."""
+    return HarreitherBinarytSensor(
+        entry_id=entry.entry_id,
+        entity_key=entity_key,
+        entity_description=replace(
+            classification.description, key=entity_key, name=entity_name
+        ),
+        data_entry=data_entry,
+    )
+
+
+def _create_enum_sensor(
+    classification: Classification,
+    entry: HarreitherConfigEntry,
+    entity_key: str,
+    entity_name: str,
+    data_entry: Entry,
+) -> HarreitherEntity:
+    """Create an enum sensor for a multi element list."""
+    return HarreitherEnumSensor(
+        entry_id=entry.entry_id,
+        entity_key=entity_key,
+        entity_name=entity_name,
+        options=list(classification.signature.options),
+        data_entry=data_entry,
+    )
+
+
+ENTITY_RULES: list[EntityRule] = [
+    EntityRule(
+        name="temperature sensor",
+        platform=Platform.SENSOR,
+        matches=lambda sig: sig.unit == "°C" and sig.type == 12,
+        factory=_create_temperature_sensor,
+        describe=lambda sig: SensorEntityDescription(
+            key="",
+            device_class=SensorDeviceClass.TEMPERATURE,
+            native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        ),
+    ),
+    EntityRule(
+        name="humidity sensor",
+        platform=Platform.SENSOR,
+        matches=lambda sig: sig.unit == "%",
+        factory=_create_sensor,
+        describe=lambda sig: SensorEntityDescription(
+            key="",
+            device_class=SensorDeviceClass.HUMIDITY,
+            native_unit_of_measurement=PERCENTAGE,
+        ),
+    ),
+    EntityRule(
+        name="select",
+        platform=Platform.SELECT,
+        matches=lambda sig: sig.type == 15 and sig.edit,
+        factory=_create_select,
+        describe=lambda sig: SelectEntityDescription(key="", options=list(sig.options)),
+    ),
+    EntityRule(
+        name="binary sensor",
+        platform=Platform.BINARY_SENSOR,
+        matches=lambda sig: sig.type == 15 and len(sig.options) == 2,
+        factory=_create_binary_sensor,
+        describe=lambda sig: BinarySensorEntityDescription(key="", device_class=None),
+    ),
+    EntityRule(
+        name="enum sensor",
+        platform=Platform.SENSOR,
+        matches=lambda sig: sig.type == 15 and len(sig.options) > 2,
+        factory=_create_enum_sensor,
+    ),
+]
+
+
+def register_entity_rule(rule: EntityRule, index: int | None = None) -> None:
+    """Add a classification rule, before the rule at index if given."""
+    if index is None:
+        ENTITY_RULES.append(rule)
+    else:
+        ENTITY_RULES.insert(index, rule)
+    classify_signature.cache_clear()
+
+
+@lru_cache(maxsize=None)
+def classify_signature(signature: DescriptorSignature) -> Classification | None:
+    """Return the classification of a signature, or None if no rule matches."""
+    for rule in ENTITY_RULES:
+        if rule.matches(signature):
+            return Classification(
+                rule=rule,
+                signature=signature,
+                description=rule.describe(signature) if rule.describe else None,
+            )
+    return None
@@ -2,9 +2,13 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping
+from typing import Any
+
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import callback
 from homeassistant.helpers import selector
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers.service_info.zeroconf import ZeroconfServiceInfo
@@ -14,9 +18,28 @@ from .api import (
     HarrieitherClientCommunicationError,
     HarrieitherClientError,
 )
-from .const import DOMAIN, LOGGER, CONF_AREA
-from .brain import Connection
-from .__init__ import get_url_from_host
+from .const import (
+    DOMAIN,
+    LOGGER,
+    CONF_AREA,
+    CONF_DEADBAND,
+    CONF_DEADBAND_ENTITIES,
+    CONF_DEADBAND_MAX_AGE,
+    CONF_EXCLUDED_SCREENS,
+    CONF_RECONNECT_MAX_DELAY,
+    CONF_REFRESH_INTERVAL,
+    CONF_SCREENS,
+    CONF_WATCHDOG_TIMEOUT,
+    COALESCE_OPTIONS,
+    DEFAULT_DEADBAND_MAX_AGE,
+    DEFAULT_RECONNECT_MAX_DELAY,
+    DEFAULT_WATCHDOG_TIMEOUT,
+)
+from . import get_url_from_host
+from .catalog import get_catalog_store, parse_catalog
+from .connection import HarreitherConnection
+from .deadband import Deadband
+from .handoff import async_park_connection
 
 
 class HarreitherConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -26,6 +49,16 @@ class HarreitherConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     MINOR_VERSION = 1
 
     _discovered_host: str | None = None
+    # URL, username and logged in connection of the last credential check
+    _validated: tuple[str, str, HarreitherConnection] | None = None
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> HarreitherOptionsFlow:
+        """Return the options flow for this handler."""
+        return HarreitherOptionsFlow()
 
     def _build_schema(self, defaults: dict | None = None) -> vol.Schema:
         """Return form schema with optional defaults."""
@@ -88,6 +121,7 @@ class HarreitherConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             else:
                 await self.async_set_unique_id(user_input[CONF_HOST])
                 self._abort_if_unique_id_configured()
+                self._async_park_validated_connection()
                 return self.async_create_entry(
                     title=user_input[CONF_USERNAME],
                     data=user_input,
@@ -151,6 +185,7 @@ class HarreitherConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             else:
                 await self.async_set_unique_id(device_id)
                 self._abort_if_unique_id_mismatch(reason="wrong_account")
+                self._async_park_validated_connection()
                 return self.async_update_reload_and_abort(
                     entry,
                     data_updates=user_input,
@@ -170,12 +205,79 @@ class HarreitherConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             errors=errors,
         )
 
+    async def async_step_reauth(
+        self,
+        entry_data: Mapping[str, Any],
+    ) -> config_entries.ConfigFlowResult:
+        """Handle a controller that keeps denying the stored credentials."""
+        return await self.async_step_reauth_confirm()
+
+    async def async_step_reauth_confirm(
+        self,
+        user_input: dict | None = None,
+    ) -> config_entries.ConfigFlowResult:
+        """Ask for new credentials and restart the connection with them."""
+
+        errors: dict[str, str] = {}
+        entry = self._get_reauth_entry()
+
+        if user_input is not None:
+            try:
+                await self._test_credentials(
+                    host=entry.data[CONF_HOST],
+                    username=user_input[CONF_USERNAME],
+                    password=user_input[CONF_PASSWORD],
+                )
+            except HarrieitherClientAuthenticationError as exception:
+                LOGGER.warning(exception)
+                errors["base"] = "auth"
+            except HarrieitherClientCommunicationError as exception:
+                LOGGER.error(exception)
+                errors["base"] = "connection"
+            except HarrieitherClientError as exception:
+                LOGGER.exception(exception)
+                errors["base"] = "unknown"
+            else:
+                self._async_park_validated_connection()
+                return self.async_update_reload_and_abort(
+                    entry,
+                    data_updates=user_input,
+                )
+
+        return self.async_show_form(
+            step_id="reauth_confirm",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_USERNAME,
+                        default=entry.data.get(CONF_USERNAME, vol.UNDEFINED),
+                    ): selector.TextSelector(
+                        selector.TextSelectorConfig(
+                            type=selector.TextSelectorType.TEXT,
+                        ),
+                    ),
+                    vol.Required(CONF_PASSWORD): selector.TextSelector(
+                        selector.TextSelectorConfig(
+                            type=selector.TextSelectorType.PASSWORD,
+                        ),
+                    ),
+                },
+            ),
+            errors=errors,
+        )
+
     async def _test_credentials(self, host: str, username: str, password: str) -> str:
-        """Validate credentials and return the device id."""
+        """Validate credentials and return the device id.
+
+        The logged in connection is kept until the flow finishes. It is parked
+        right before the entry (re)starts, so that the entry can start its first
+        session on it without another handshake, and closed otherwise.
+        """
         ws_url = get_url_from_host(host)
 
-        conn_obj = Connection()
+        conn_obj = HarreitherConnection(traverse_screens_on_init=True)
         device_id: str | None = None
+        validated = False
         try:
             try:
                 await conn_obj.async_websocket_connect(ws_url, proxy_url=None)
@@ -208,7 +310,243 @@ class HarreitherConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 raise HarrieitherClientError(
                     "Device id missing from controller response"
                 )
+            validated = True
         finally:
-            await conn_obj.async_close()
+            if validated:
+                self._async_close_validated_connection()
+                self._validated = (ws_url, username, conn_obj)
+            else:
+                await conn_obj.async_close()
 
         return device_id
+
+    @callback
+    def _async_park_validated_connection(self) -> None:
+        """Hand the validated connection to the entry that is about to start."""
+        if self._validated is not None:
+            async_park_connection(self.hass, *self._validated)
+            self._validated = None
+
+    @callback
+    def _async_close_validated_connection(self) -> None:
+        """Close the validated connection, if it was not handed to an entry."""
+        if self._validated is not None:
+            self.hass.async_create_task(self._validated[2].async_close())
+            self._validated = None
+
+    @callback
+    def async_remove(self) -> None:
+        """Close the validated connection of a flow that aborted or was dismissed."""
+        self._async_close_validated_connection()
+
+
+def _screen_option(screen_key: tuple) -> str:
+    """Return the selector value of a screen key."""
+    screen_id, obj_id = screen_key
+    return f"{screen_id}" if obj_id is None else f"{screen_id}/{obj_id}"
+
+
+class HarreitherOptionsFlow(config_entries.OptionsFlow):
+    """Options flow for Harreither."""
+
+    def __init__(self) -> None:
+        """Initialize the options flow."""
+        self._options: dict = {}
+        self._screens: dict[tuple, str] = {}
+
+    def _build_schema(self) -> vol.Schema:
+        """Return options form schema."""
+        schema = {
+            vol.Optional(option, default=0): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=0,
+                    max=60,
+                    step=0.5,
+                    unit_of_measurement="s",
+                    mode=selector.NumberSelectorMode.BOX,
+                ),
+            )
+            for option in COALESCE_OPTIONS
+        }
+        schema[vol.Optional(CONF_REFRESH_INTERVAL, default=0)] = (
+            selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=0,
+                    max=3600,
+                    step=1,
+                    unit_of_measurement="s",
+                    mode=selector.NumberSelectorMode.BOX,
+                ),
+            )
+        )
+        schema[
+            vol.Optional(CONF_WATCHDOG_TIMEOUT, default=DEFAULT_WATCHDOG_TIMEOUT)
+        ] = selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                min=0,
+                max=300,
+                step=1,
+                unit_of_measurement="s",
+                mode=selector.NumberSelectorMode.BOX,
+            ),
+        )
+        schema[
+            vol.Optional(CONF_RECONNECT_MAX_DELAY, default=DEFAULT_RECONNECT_MAX_DELAY)
+        ] = selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                min=10,
+                max=3600,
+                step=1,
+                unit_of_measurement="s",
+                mode=selector.NumberSelectorMode.BOX,
+            ),
+        )
+        return vol.Schema(schema)
+
+    async def _async_load_screens(self) -> dict[tuple, str]:
+        """Return titles of the screens known from the connection or the catalog.
+
+        Excluded screens are always listed, so they can be included again.
+        """
+        screens: dict[tuple, str] = {}
+        runtime_data = getattr(self.config_entry, "runtime_data", None)
+        connection = runtime_data.connection if runtime_data else None
+        if connection is not None:
+            for screen_key, screen in connection.entries.screens.items():
+                screens[screen_key] = (screen.get("title") or "").strip()
+        else:
+            data = await get_catalog_store(
+                self.hass, self.config_entry.entry_id
+            ).async_load()
+            if data:
+                for screen_key, screen in parse_catalog(data)[0].items():
+                    screens[screen_key] = (screen.get("title") or "").strip()
+
+        for screen_id, obj_id in self.config_entry.options.get(
+            CONF_EXCLUDED_SCREENS, []
+        ):
+            screens.setdefault((screen_id, obj_id), "")
+        return screens
+
+    async def async_step_init(
+        self,
+        user_input: dict | None = None,
+    ) -> config_entries.ConfigFlowResult:
+        """Manage the update options."""
+        if user_input is not None:
+            self._options.update(user_input)
+            return await self.async_step_deadband()
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=self.add_suggested_values_to_schema(
+                self._build_schema(), self.config_entry.options
+            ),
+        )
+
+    async def async_step_deadband(
+        self,
+        user_input: dict | None = None,
+    ) -> config_entries.ConfigFlowResult:
+        """Manage the deadband of numeric sensors."""
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            try:
+                Deadband.parse(user_input.get(CONF_DEADBAND))
+                for value in user_input.get(CONF_DEADBAND_ENTITIES, {}).values():
+                    Deadband.parse(value)
+            except (AttributeError, ValueError):
+                errors["base"] = "invalid_deadband"
+            else:
+                self._options.update(user_input)
+                return await self._async_step_screens_or_finish()
+
+        return self.async_show_form(
+            step_id="deadband",
+            data_schema=self.add_suggested_values_to_schema(
+                vol.Schema(
+                    {
+                        vol.Optional(CONF_DEADBAND): selector.TextSelector(),
+                        vol.Optional(
+                            CONF_DEADBAND_MAX_AGE, default=DEFAULT_DEADBAND_MAX_AGE
+                        ): selector.NumberSelector(
+                            selector.NumberSelectorConfig(
+                                min=10,
+                                max=86400,
+                                step=1,
+                                unit_of_measurement="s",
+                                mode=selector.NumberSelectorMode.BOX,
+                            ),
+                        ),
+                        vol.Optional(CONF_DEADBAND_ENTITIES): selector.ObjectSelector(),
+                    },
+                ),
+                user_input or self.config_entry.options,
+            ),
+            errors=errors,
+        )
+
+    async def _async_step_screens_or_finish(self) -> config_entries.ConfigFlowResult:
+        """Continue with the screens step when screens are known."""
+        self._screens = await self._async_load_screens()
+        if self._screens:
+            return await self.async_step_screens()
+        self._options[CONF_EXCLUDED_SCREENS] = self.config_entry.options.get(
+            CONF_EXCLUDED_SCREENS, []
+        )
+        return self.async_create_entry(data=self._options)
+
+    async def async_step_screens(
+        self,
+        user_input: dict | None = None,
+    ) -> config_entries.ConfigFlowResult:
+        """Choose the screens that are traversed and get entities.
+
+        The excluded screens are stored, so screens the controller adds later
+        are included by default.
+        """
+        if user_input is not None:
+            included = set(user_input.get(CONF_SCREENS, []))
+            self._options[CONF_EXCLUDED_SCREENS] = [
+                list(screen_key)
+                for screen_key in self._screens
+                if _screen_option(screen_key) not in included
+            ]
+            return self.async_create_entry(data=self._options)
+
+        excluded = {
+            (screen_id, obj_id)
+            for screen_id, obj_id in self.config_entry.options.get(
+                CONF_EXCLUDED_SCREENS, []
+            )
+        }
+        options = [
+            selector.SelectOptionDict(
+                value=_screen_option(screen_key),
+                label=f"{title or 'Screen'} ({_screen_option(screen_key)})",
+            )
+            for screen_key, title in sorted(
+                self._screens.items(), key=lambda item: (item[1], str(item[0]))
+            )
+        ]
+        return self.async_show_form(
+            step_id="screens",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_SCREENS,
+                        default=[
+                            _screen_option(screen_key)
+                            for screen_key in self._screens
+                            if screen_key not in excluded
+                        ],
+                    ): selector.SelectSelector(
+                        selector.SelectSelectorConfig(
+                            options=options,
+                            multiple=True,
+                            mode=selector.SelectSelectorMode.LIST,
+                        ),
+                    ),
+                },
+            ),
+        )
@@ -0,0 +1,472 @@
+"""Connection to the Harreither Brain used by the integration."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from contextlib import suppress
+from dataclasses import dataclass
+from functools import partial
+from typing import TYPE_CHECKING
+
+from .api import HarrieitherClientAuthenticationError
+from .brain import MC_AUTO, Connection, MessageSend, TypeInt
+from .const import COMMAND_BURST, COMMAND_RATE, LOGGER, WRITE_PIPELINE_WINDOW
+from .flight_recorder import FlightRecorder
+from .scheduler import (
+    PRIORITY_AUTOMATION,
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    CommandScheduler,
+)
+from .stats import ConnectionStats, KeyStats
+from .updates import UpdateQueue
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from .brain import Entry
+
+
+@dataclass(slots=True)
+class _PendingWrite:
+    """A value waiting to be written to the controller."""
+
+    data_entry: Entry
+    value: int
+    future: asyncio.Future
+
+
+class HarreitherConnection(Connection):
+    """Brain client connection with screen tracking and a command scheduler.
+
+    The active screen is derived from outgoing traffic: ACTUAL_SCREEN switches
+    to the given screen, while ACTION_SELECTED (traversal, keepalive) may open
+    any other screen, so it makes the active screen unknown.
+
+    All acknowledged traffic, including the client's own screen traversal, goes
+    through the scheduler, so user writes are not stuck behind background work.
+
+    The controller pushes the system time every second, so a connection that
+    has been silent for watchdog_timeout seconds is dead and gets aborted.
+
+    Entry updates are queued instead of notified inline, and a dispatcher task
+    calls the notify callbacks, so slow callbacks never stall the reader.
+
+    The client sets event_initial_traverse_screens_complete also when the
+    traversal failed, traversal_completed tells whether it ran to its end.
+    """
+
+    def __init__(self, watchdog_timeout: float = 0, **kwargs) -> None:
+        """Initialize the connection."""
+        super().__init__(**kwargs)
+        self.watchdog_timeout = watchdog_timeout
+        self.last_received: float | None = None  # Loop time of the last message
+        self.authenticated: bool | None = None  # Login result, None until answered
+        self.active_screen: tuple | None = None
+        # Screen a background command navigated to and still relies on
+        self._background_screen: tuple | None = None
+        self.scheduler = CommandScheduler(COMMAND_RATE, COMMAND_BURST)
+        self.updates = UpdateQueue()
+        # Replaced by the entry's counters, which outlive single connections
+        self.stats = ConnectionStats()
+        self.key_stats: dict[tuple, KeyStats] = {}
+        self.flight_recorder = FlightRecorder()
+        self._auth_started: float | None = None
+        self.session_started: float | None = None  # Monotonic time of the login
+        self._pending_writes: dict[int, dict[tuple, _PendingWrite]] = {}
+        self._write_tasks: set[asyncio.Task] = set()
+        # Screens whose menus the traversal must not open
+        self.excluded_screens: set[tuple] = set()
+        self.traversal_completed = False
+        if self.traverse_screens_obj is not None:
+            self.traverse_screens_obj.traverse_screens = partial(
+                self._async_traverse_screens,
+                self.traverse_screens_obj.traverse_screens,
+            )
+
+    async def _async_traverse_screens(self, traverse_screens: Callable) -> None:
+        """Run the client's screen traversal, recording that it finished."""
+        await traverse_screens()
+        self.traversal_completed = True
+
+    async def messages_process(self):
+        """Process messages while running the command scheduler."""
+        tasks = [
+            asyncio.create_task(self.scheduler.async_run()),
+            asyncio.create_task(
+                self.updates.async_run(
+                    super().async_notify_update, self.stats.dispatch_time
+                )
+            ),
+        ]
+        if self.watchdog_timeout:
+            tasks.append(asyncio.create_task(self._async_watchdog()))
+        try:
+            await super().messages_process()
+        except Exception as err:
+            if self.authenticated is False:
+                raise HarrieitherClientAuthenticationError(
+                    "Controller denied the login"
+                ) from err
+            raise
+        finally:
+            for task in tasks:
+                task.cancel()
+                with suppress(asyncio.CancelledError):
+                    await task
+
+    async def async_websocket_connect(self, ws_url, proxy_url=None):
+        """Open the websocket, recording how long it took."""
+        started = time.monotonic()
+        await super().async_websocket_connect(ws_url, proxy_url=proxy_url)
+        self.stats.record_phase("connect", time.monotonic() - started)
+
+    async def establish_secure_connection(self):
+        """Run the secure handshake, recording how long it took."""
+        started = time.monotonic()
+        result = await super().establish_secure_connection()
+        self.stats.record_phase("secure_handshake", time.monotonic() - started)
+        return result
+
+    async def async_notify_update(self, key: tuple, entry: Entry, new: bool) -> None:
+        """Count an entry update per key and queue it for the dispatcher task.
+
+        Updates are counted here, as the queue collapses updates of a key that
+        arrive faster than they are dispatched.
+        """
+        now = time.monotonic()
+        if (stats := self.key_stats.get(key)) is None:
+            stats = self.key_stats[key] = KeyStats(now)
+        stats.record_update(now, entry.get("value"))
+        self.updates.put(key, entry, new)
+
+    async def async_authenticate(self, username: str, password: str) -> None:
+        """Queue the login, a denied login ends messages_process."""
+        self._auth_started = time.monotonic()
+        await self.enqueue_authentication_flow(
+            username,
+            password,
+            async_auth_result_callback=self._async_auth_result,
+        )
+
+    async def async_start_session(self) -> None:
+        """Start the session on a connection whose login already succeeded."""
+        self.authenticated = True
+        self.session_started = time.monotonic()
+        await self.authentication_obj.enqueue_AUTH_APPLY_TOKEN()
+
+    async def _async_auth_result(self, success: bool) -> None:
+        """Record the login result, dropping the connection when it was denied."""
+        self.authenticated = success
+        self.session_started = time.monotonic()
+        if self._auth_started is not None:
+            self.stats.record_phase(
+                "authentication", self.session_started - self._auth_started
+            )
+        if not success and self.ws is not None:
+            self.ws.transport.abort()
+
+    async def receive_message(self):
+        """Receive a message, recording its arrival for the watchdog."""
+        msg = await super().receive_message()
+        self.last_received = asyncio.get_running_loop().time()
+        self.stats.inbound.record()
+        self.flight_recorder.record_message("in", msg)
+        return msg
+
+    async def _async_watchdog(self) -> None:
+        """Abort the websocket once the controller has been silent for too long.
+
+        Aborting makes the pending receive fail right away, instead of waiting
+        for TCP to notice a half-open connection.
+        """
+        loop = asyncio.get_running_loop()
+        # Silence counts from the start of the session, a connection handed
+        # off by the config flow last received during its login
+        self.last_received = loop.time()
+        while True:
+            silence = loop.time() - self.last_received
+            if silence >= self.watchdog_timeout:
+                break
+            await asyncio.sleep(self.watchdog_timeout - silence)
+
+        LOGGER.warning(
+            "No traffic from controller for %.0f seconds, dropping connection",
+            silence,
+        )
+        if self.ws is not None:
+            self.ws.transport.abort()
+
+    async def send_message(self, msg: MessageSend) -> None:
+        """Send a message, updating the active screen from what is sent."""
+        self.flight_recorder.record_message("out", msg)
+        if msg.type_int == TypeInt.ACTUAL_SCREEN:
+            payload = msg.payload or {}
+            self.active_screen = (payload.get("screenID"), payload.get("objID"))
+        elif msg.type_int == TypeInt.ACTION_SELECTED:
+            self.active_screen = None
+            self._background_screen = None
+        await super().send_message(msg)
+
+    async def enqueue_message_get_ack(self, msg: MessageSend) -> bool:
+        """Send a message as background traffic and wait for its ACK/NACK.
+
+        Traversal steps on excluded screens are answered with a NACK without
+        being sent, so nothing below an excluded screen is opened.
+        """
+        if self.excluded_screens and self._is_excluded(msg):
+            return False
+        return await self.scheduler.async_submit(
+            PRIORITY_BACKGROUND, partial(self._async_send_background, msg)
+        )
+
+    def _is_excluded(self, msg: MessageSend) -> bool:
+        """Return whether a navigation message acts on an excluded screen."""
+        payload = msg.payload or {}
+        if msg.type_int == TypeInt.ACTUAL_SCREEN:
+            screen_key = (payload.get("screenID"), payload.get("objID"))
+        elif msg.type_int == TypeInt.ACTION_SELECTED:
+            data_entry = self.entries.get_entry(
+                (payload.get("VID"), payload.get("detail"), payload.get("objID"))
+            )
+            screen_key = data_entry.get("_screen_key") if data_entry else None
+        else:
+            return False
+        return screen_key in self.excluded_screens
+
+    async def _async_send_background(self, msg: MessageSend) -> bool:
+        """Send a background message, remembering the screen it navigated to."""
+        ack = await self._async_send_get_ack(msg)
+        if msg.type_int == TypeInt.ACTUAL_SCREEN:
+            self._background_screen = self.active_screen if ack else None
+        return ack
+
+    async def _async_send_get_ack(self, msg: MessageSend) -> bool:
+        """Send a message within a running command, respecting the rate limit."""
+        await self.scheduler.async_throttle()
+        sent = time.monotonic()
+        ack = await super().enqueue_message_get_ack(msg)
+        self.stats.ack_rtt.record(time.monotonic() - sent)
+        return ack
+
+    async def _async_activate_screen(self, data_entry: Entry) -> bool:
+        """Navigate to the screen of data_entry unless it is already active."""
+        screen_key = data_entry["_screen_key"]
+        if self.active_screen == screen_key:
+            return True
+
+        screen_ack = await self._async_send_get_ack(
+            data_entry.message_activate_entering_screen()
+        )
+        LOGGER.debug("Received ACK for ACTUAL_SCREEN %s: %s", screen_key, screen_ack)
+        if not screen_ack:
+            self.active_screen = None
+        return screen_ack
+
+    async def _async_restore_background_screen(self) -> None:
+        """Return to the screen a background command relies on, if a write left it.
+
+        The traversal navigates with ACTUAL_SCREEN and then sends ACTION_SELECTED
+        as a separate command, so writes may run in between.
+        """
+        screen_key = self._background_screen
+        if screen_key is None or self.active_screen == screen_key:
+            return
+        await self._async_navigate(screen_key)
+
+    async def _async_navigate(self, screen_key: tuple) -> bool:
+        """Send ACTUAL_SCREEN for a screen key."""
+        screen_id, obj_id = screen_key
+        payload = {"screenID": screen_id}
+        if obj_id is not None:
+            payload["objID"] = obj_id
+        screen_ack = await self._async_send_get_ack(
+            MessageSend(type_int=TypeInt.ACTUAL_SCREEN, mc=MC_AUTO, payload=payload)
+        )
+        if not screen_ack:
+            self.active_screen = None
+        return screen_ack
+
+    async def async_refresh_screen(self, screen_key: tuple) -> bool:
+        """Show a screen as background traffic, so the controller pushes its values."""
+
+        async def _async_refresh() -> bool:
+            if self.active_screen == screen_key:
+                return True
+            return await self._async_navigate(screen_key)
+
+        return await self.scheduler.async_submit(
+            PRIORITY_BACKGROUND, _async_refresh, dedupe_key=("refresh", screen_key)
+        )
+
+    async def _async_send_pipelined(self, msgs: list[MessageSend]) -> list[bool]:
+        """Send messages with a bounded window of outstanding ACKs.
+
+        The client matches each ACK/NACK to its message, so results come back
+        in the order of msgs.
+        """
+        loop = asyncio.get_running_loop()
+        window = asyncio.Semaphore(WRITE_PIPELINE_WINDOW)
+        ack_futures = []
+        for msg in msgs:
+            await window.acquire()
+            await self.scheduler.async_throttle()
+            ack_future = loop.create_future()
+            sent = time.monotonic()
+
+            async def ack_callback(
+                is_ack: bool, ack_future=ack_future, sent=sent
+            ) -> None:
+                self.stats.ack_rtt.record(time.monotonic() - sent)
+                window.release()
+                if not ack_future.done():
+                    ack_future.set_result(is_ack)
+
+            await self.enqueue_message(msg, ack_callback)
+            ack_futures.append(ack_future)
+        return list(await asyncio.gather(*ack_futures))
+
+    def _order_screens(self, screen_keys: Iterable[tuple]) -> list[tuple]:
+        """Order screens to write to so that the fewest screen switches are needed.
+
+        The active screen needs no navigation, so it goes first. The screen a
+        background command relies on goes last, so no switch back is needed.
+        """
+
+        def sort_key(screen_key: tuple) -> int:
+            if screen_key == self.active_screen:
+                return 0
+            if screen_key == self._background_screen:
+                return 2
+            return 1
+
+        return sorted(screen_keys, key=sort_key)
+
+    async def _async_write_screen(self, writes: list[_PendingWrite]) -> list[bool]:
+        """Write values that share a screen, returning one result each.
+
+        The controller may leave a screen on its own, so a NACK makes the active
+        screen unknown. Writes that relied on the screen still being active are
+        retried once after navigating to it.
+        """
+        data_entry = writes[0].data_entry
+        navigated = self.active_screen != data_entry["_screen_key"]
+        if not await self._async_activate_screen(data_entry):
+            return [False] * len(writes)
+        results = await self._async_send_pipelined(
+            [w.data_entry.message_edit_value(w.value) for w in writes]
+        )
+        if all(results):
+            return results
+
+        self.active_screen = None
+        if navigated or not await self._async_activate_screen(data_entry):
+            return results
+        rejected = [index for index, result in enumerate(results) if not result]
+        retried = await self._async_send_pipelined(
+            [writes[i].data_entry.message_edit_value(writes[i].value) for i in rejected]
+        )
+        for index, result in zip(rejected, retried):
+            results[index] = result
+        if not all(retried):
+            self.active_screen = None
+        return results
+
+    async def _async_flush_writes(self, priority: int) -> None:
+        """Write all pending values of a priority class, as a single command.
+
+        Writes are grouped by screen, so each screen is navigated to once and its
+        writes are pipelined.
+        """
+        pending = self._pending_writes.pop(priority, {})
+        groups: dict[tuple, list[_PendingWrite]] = {}
+        for write in pending.values():
+            groups.setdefault(write.data_entry["_screen_key"], []).append(write)
+
+        try:
+            for screen_key in self._order_screens(groups):
+                writes = groups[screen_key]
+                results = await self._async_write_screen(writes)
+                LOGGER.debug("Received ACKs for writes on %s: %s", screen_key, results)
+                for write, result in zip(writes, results):
+                    write.future.set_result(result)
+            await self._async_restore_background_screen()
+        except BaseException as err:
+            if isinstance(err, asyncio.CancelledError):
+                err = ConnectionError("Connection closed before write completed")
+            for write in pending.values():
+                if not write.future.done():
+                    write.future.set_exception(err)
+            raise
+
+    async def _async_submit_writes(self, priority: int) -> None:
+        """Submit the flush of pending writes, failing them if it cannot run."""
+        try:
+            await self.scheduler.async_submit(
+                priority, partial(self._async_flush_writes, priority)
+            )
+        except Exception as err:  # noqa: BLE001
+            for write in self._pending_writes.pop(priority, {}).values():
+                if not write.future.done():
+                    write.future.set_exception(err)
+
+    def _take_pending_write(self, key: tuple) -> tuple[int, _PendingWrite] | None:
+        """Remove the write to key that was not sent yet, return it and its class."""
+        for priority, pending in self._pending_writes.items():
+            if (write := pending.pop(key, None)) is not None:
+                return priority, write
+        return None
+
+    def _get_pending_writes(self, priority: int) -> dict[tuple, _PendingWrite]:
+        """Return the pending writes of a priority class, submitting its flush."""
+        pending = self._pending_writes.get(priority)
+        if pending is None:
+            pending = self._pending_writes[priority] = {}
+            self._write_tasks.add(
+                task := asyncio.get_running_loop().create_task(
+                    self._async_submit_writes(priority)
+                )
+            )
+            task.add_done_callback(self._write_tasks.discard)
+        return pending
+
+    async def async_write_values(
+        self,
+        writes: list[tuple[Entry, int]],
+        priority: int = PRIORITY_AUTOMATION,
+    ) -> list[bool]:
+        """Write several values to the controller, returning one result each.
+
+        Concurrent calls are batched into one scheduler command per priority
+        class. A pending write to the same key that was not sent yet is
+        superseded, in whichever class it waits, and its caller receives the
+        result of the newer write. The newer value is sent with the higher
+        priority of the two, so an older value can never be sent after it.
+        """
+        loop = asyncio.get_running_loop()
+        futures = []
+        for data_entry, value in writes:
+            key = self.entries.make_key_from_object(data_entry)
+            write_priority = priority
+            if (queued := self._take_pending_write(key)) is not None:
+                queued_priority, write = queued
+                write_priority = min(priority, queued_priority)
+                write.data_entry = data_entry
+                write.value = value
+                self.scheduler.superseded += 1
+            else:
+                write = _PendingWrite(data_entry, value, loop.create_future())
+            self._get_pending_writes(write_priority)[key] = write
+            futures.append(write.future)
+        return list(await asyncio.gather(*futures))
+
+    async def async_write_value(
+        self,
+        data_entry: Entry,
+        value: int,
+        priority: int = PRIORITY_INTERACTIVE,
+    ) -> bool:
+        """Write a single value to the controller."""
+        (result,) = await self.async_write_values([(data_entry, value)], priority)
+        return result
@@ -7,3 +7,71 @@ LOGGER: Logger = getLogger(__package__)
 DOMAIN = "harreither"
 ATTRIBUTION = ""
 CONF_AREA = "area"
+
+# Seconds to buffer newly discovered entities before adding them in one batch
+ENTITY_CREATION_WINDOW = 2.0
+
+# Options: seconds to coalesce updates per entity class, 0 disables coalescing
+CONF_COALESCE_TEMPERATURE = "coalesce_temperature"
+CONF_COALESCE_HUMIDITY = "coalesce_humidity"
+CONF_COALESCE_ENUM = "coalesce_enum"
+COALESCE_OPTIONS = (
+    CONF_COALESCE_TEMPERATURE,
+    CONF_COALESCE_HUMIDITY,
+    CONF_COALESCE_ENUM,
+)
+
+# Rate limit of messages sent to the controller: sustained per second and burst
+COMMAND_RATE = 10.0
+COMMAND_BURST = 20
+# Maximum number of value writes awaiting their ACK at the same time
+WRITE_PIPELINE_WINDOW = 4
+
+# Options: screens, as [screenID, objID] pairs, that are not traversed or materialised
+CONF_EXCLUDED_SCREENS = "excluded_screens"
+# Options flow field listing the screens that stay included
+CONF_SCREENS = "screens"
+
+# Options: seconds without any controller traffic before the connection is dropped
+CONF_WATCHDOG_TIMEOUT = "watchdog_timeout"
+DEFAULT_WATCHDOG_TIMEOUT = 15
+
+# Options: upper bound in seconds of the reconnect backoff
+CONF_RECONNECT_MAX_DELAY = "reconnect_max_delay"
+DEFAULT_RECONNECT_MAX_DELAY = 300
+# First reconnect backoff step in seconds, doubled on every further failure
+RECONNECT_BASE_DELAY = 2.0
+# Denied logins in a row before reconnecting stops and reauthentication starts
+AUTH_FAILURE_LIMIT = 3
+
+# Seconds the connection validated by the config flow is kept for the new entry
+HANDOFF_TTL = 30.0
+
+# Options: minimum change of numeric sensors, globally and per entity id, as
+# an absolute value ("0.2") or relative to the last value ("1%")
+CONF_DEADBAND = "deadband"
+CONF_DEADBAND_ENTITIES = "deadband_entities"
+# Options: seconds after which a value held back by the deadband is written anyway
+CONF_DEADBAND_MAX_AGE = "deadband_max_age"
+DEFAULT_DEADBAND_MAX_AGE = 300
+
+# Updates dispatched before the dispatcher yields to the websocket reader
+UPDATE_DISPATCH_BATCH = 64
+
+# Number of keys with the highest update rate listed in diagnostics
+HOT_KEYS_LIMIT = 50
+
+# Seconds between updates of the connection health sensors
+HEALTH_UPDATE_INTERVAL = 5
+
+# Number of recent messages and dispatch decisions kept by the flight recorder
+FLIGHT_RECORDER_SIZE = 2000
+# Per-update debug log lines per second, further lines are only recorded
+UPDATE_LOG_RATE = 20
+
+# Options: seconds between refreshes of screens with recent changes, 0 disables
+CONF_REFRESH_INTERVAL = "refresh_interval"
+# Screens without recent changes are refreshed this many times less often
+REFRESH_COLD_FACTOR = 4
+# Seconds to hold back refreshes while user or automation writes are queued
+REFRESH_BACKOFF = 5.0
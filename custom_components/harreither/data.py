@@ -2,16 +2,24 @@
 
 from __future__ import annotations
 
+from collections import Counter
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from asyncio import Task
+    from collections.abc import Callable
 
     from homeassistant.config_entries import ConfigEntry
+    from homeassistant.helpers.storage import Store
     from homeassistant.loader import Integration
 
-from .brain import Connection
+    from .deadband import Deadband
+
+from .connection import HarreitherConnection
+from .const import UPDATE_LOG_RATE
+from .flight_recorder import FlightRecorder, LogRateLimiter
+from .stats import ConnectionStats
 
 
 type HarreitherConfigEntry = ConfigEntry[HarreitherData]
@@ -25,10 +33,67 @@ class HarreitherData:
     entities: dict = field(
         default_factory=dict
     )  # Dictionary mapping entity keys to entity objects
-    connection: Connection | None = (
-        None  # Connection object from harreither_brain_client
+    connection: HarreitherConnection | None = (
+        None  # Connection object wrapping harreither_brain_client
     )
     connection_task: Task | None = None  # Task running the connection loop
     platform_dict: dict = field(
         default_factory=dict
     )  # Dictionary mapping platform domains to platform objects
+    session_keys: set = field(
+        default_factory=set
+    )  # Entity keys reported by the controller during the current connection
+    pending_entities: dict = field(
+        default_factory=dict
+    )  # Newly created entities per platform, waiting to be added in one batch
+    flush_unsub: Callable[[], None] | None = None  # Cancels the scheduled flush
+    unassigned_entities: list = field(
+        default_factory=list
+    )  # Added entities waiting for the bulk area and tag assignment
+    last_values: dict = field(
+        default_factory=dict
+    )  # Last value written to HA per entity key, used to drop unchanged pushes
+    dispatch: dict = field(
+        default_factory=dict
+    )  # Pre-classified update handler per controller key tuple
+    unmatched_signatures: Counter = field(
+        default_factory=Counter
+    )  # Entries per descriptor signature that no classification rule matched
+    suppressed_writes: int = 0  # Number of state writes skipped as unchanged
+    deadband: Deadband | None = None  # Deadband of numeric sensors without override
+    deadband_overrides: dict = field(
+        default_factory=dict
+    )  # Deadband per entity id, None disables it for that entity
+    deadband_held: dict = field(
+        default_factory=dict
+    )  # Latest value per entity key held back by the deadband
+    deadband_unsubs: dict = field(
+        default_factory=dict
+    )  # Cancel callbacks of the max-age writes per entity key
+    deadband_suppressed: int = 0  # Number of numeric updates held back by the deadband
+    screen_activity: dict = field(
+        default_factory=dict
+    )  # Monotonic time of the last value change per screen key
+    coalesce_pending: dict = field(
+        default_factory=dict
+    )  # Latest value per entity key, per coalescing option, waiting for its window
+    coalesce_unsubs: dict = field(
+        default_factory=dict
+    )  # Cancel callbacks of the scheduled coalescing flushes per option
+    excluded_screens: set = field(
+        default_factory=set
+    )  # Screen keys whose entries get no entities and whose menus are not traversed
+    key_stats: dict = field(
+        default_factory=dict
+    )  # Traffic counters per controller key tuple
+    stats: ConnectionStats = field(
+        default_factory=ConnectionStats
+    )  # Performance counters, kept across reconnects
+    flight_recorder: FlightRecorder = field(
+        default_factory=FlightRecorder
+    )  # Recent messages and dispatch decisions, kept across reconnects
+    update_log_limiter: LogRateLimiter = field(
+        default_factory=lambda: LogRateLimiter(UPDATE_LOG_RATE)
+    )  # Caps the per-update debug log lines
+    catalog_store: Store | None = None  # Storage helper for the screen/vid catalog
+    catalog_device_id: str | None = None  # Controller device id the catalog belongs to
@@ -0,0 +1,42 @@
+"""Deadband filter for numeric sensor updates.
+
+A deadband is written as a number, an absolute change in the unit of the
+sensor, or as a number followed by %, a change relative to the last written
+value. Smaller changes are held back.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class Deadband:
+    """Minimum change of a numeric value that is written to Home Assistant."""
+
+    amount: float
+    relative: bool = False
+
+    @classmethod
+    def parse(cls, value: str | float | None) -> Deadband | None:
+        """Return the deadband of an option value, or None if it is disabled.
+
+        Raises ValueError for values that are neither a number nor a percentage.
+        """
+        if value is None or value == "":
+            return None
+        text = str(value).strip()
+        relative = text.endswith("%")
+        amount = float(text.removesuffix("%"))
+        if amount < 0:
+            raise ValueError(f"Deadband must not be negative: {value}")
+        if amount == 0:
+            return None
+        return cls(amount, relative)
+
+    def holds(self, last_value: float, value: float) -> bool:
+        """Return whether the change from last_value to value is within the deadband."""
+        threshold = (
+            self.amount * abs(last_value) / 100 if self.relative else self.amount
+        )
+        return abs(value - last_value) < threshold
@@ -0,0 +1,79 @@
+"""Diagnostics support for harreither."""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+
+from .const import HOT_KEYS_LIMIT
+from .scheduler import PRIORITY_NAMES
+from .stats import hot_keys
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .data import HarreitherConfigEntry
+
+TO_REDACT = {CONF_PASSWORD, CONF_USERNAME, "token", "title"}
+# Authentication and key exchange fields in recorded message payloads
+PAYLOAD_REDACT = TO_REDACT | {"hash", "salt", "secret"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant,
+    entry: HarreitherConfigEntry,
+) -> dict[str, Any]:
+    """Return diagnostics of a config entry."""
+    runtime_data = entry.runtime_data
+    connection = runtime_data.connection
+    now = time.monotonic()
+    diagnostics: dict[str, Any] = {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "connected": connection is not None,
+        "connection": runtime_data.stats.as_dict(),
+        "entities": len(runtime_data.entities),
+        "suppressed_writes": runtime_data.suppressed_writes,
+        "deadband_suppressed": runtime_data.deadband_suppressed,
+    }
+    diagnostics["hot_keys"] = [
+        {
+            "key": list(key),
+            "entity_id": getattr(
+                runtime_data.entities.get(repr(key)), "entity_id", None
+            ),
+            "updates_per_second": round(rate, 3),
+            "received": stats.received,
+            "changed": stats.changed,
+            "written": stats.written,
+            "seconds_since_update": round(now - stats.last_update, 1),
+        }
+        for key, stats, rate in hot_keys(runtime_data.key_stats, HOT_KEYS_LIMIT)
+    ]
+    diagnostics["flight_recorder"] = runtime_data.flight_recorder.dump(
+        lambda payload: async_redact_data(payload, PAYLOAD_REDACT)
+    )
+    if connection is not None:
+        scheduler = connection.scheduler
+        updates = connection.updates
+        diagnostics["scheduler"] = {
+            "queue_depths": scheduler.queue_depths(),
+            "max_depths": {
+                PRIORITY_NAMES[priority]: depth
+                for priority, depth in scheduler.max_depths.items()
+            },
+            "submitted": scheduler.submitted,
+            "completed": scheduler.completed,
+            "superseded": scheduler.superseded,
+            "throttled": scheduler.bucket.throttled,
+        }
+        diagnostics["updates"] = {
+            "depth": len(updates),
+            "max_depth": updates.max_depth,
+            "received": updates.received,
+            "collapsed": updates.collapsed,
+            "dispatched": updates.dispatched,
+        }
+    return diagnostics
@@ -0,0 +1,73 @@
+"""Base entity for harreither."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.helpers.restore_state import RestoreEntity
+
+if TYPE_CHECKING:
+    from homeassistant.core import State
+
+    from .brain import Entry
+
+
+class HarreitherEntity(RestoreEntity):
+    """Common behaviour for entities backed by a controller Entry.
+
+    Entities restored from the catalog start with the state they had before
+    Home Assistant restarted. That state is flagged stale until the controller
+    reports the entry again.
+    """
+
+    _data_entry: Entry | None
+    _stale: bool = False
+
+    async def async_added_to_hass(self) -> None:
+        """Restore the last known state when the controller has not reported yet."""
+        await super().async_added_to_hass()
+        if self.available:
+            return
+        last_state = await self.async_get_last_state()
+        if last_state is None or last_state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            return
+        if self.restore_last_state(last_state):
+            self._stale = True
+            self._attr_available = True
+
+    def restore_last_state(self, last_state: State) -> bool:
+        """Apply a restored state, return whether it was usable."""
+        return False
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return stale while the state is the one restored after a restart."""
+        return {"stale": True} if self._stale else None
+
+    def rebind_entry(self, data_entry: Entry) -> None:
+        """Attach the entity to the Entry of a new connection and mark it available."""
+        self._data_entry = data_entry
+        self._stale = False
+        self._attr_available = True
+
+    def set_unavailable(self) -> None:
+        """Mark the entity unavailable while the controller is disconnected.
+
+        A restored state stays available, flagged stale, until the controller
+        reports the entry for the first time.
+        """
+        if self._stale:
+            return
+        self._attr_available = False
+        self._async_write_state()
+
+    def _async_write_state(self) -> bool:
+        """Write state to Home Assistant once the entity has been added.
+
+        Return whether the state was written.
+        """
+        if self.hass is None:
+            return False
+        self.async_write_ha_state()
+        return True
@@ -0,0 +1,114 @@
+"""In-memory flight recorder of recent controller traffic and dispatch decisions.
+
+Recording appends a tuple to a bounded deque, no copying, formatting or logging
+happens per message. The buffer is formatted only when diagnostics are downloaded.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any
+
+from .const import FLIGHT_RECORDER_SIZE
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+# Payload levels included in a dump, deeper values are replaced by their size
+SUMMARY_DEPTH = 3
+
+
+class FlightRecorder:
+    """Ring buffer of the last FLIGHT_RECORDER_SIZE events."""
+
+    def __init__(self, size: int = FLIGHT_RECORDER_SIZE) -> None:
+        """Initialize an empty recorder."""
+        self._events: deque[tuple] = deque(maxlen=size)
+
+    def record(self, kind: str, *details: Any) -> None:
+        """Record an event, details must not be mutated afterwards."""
+        self._events.append((time.monotonic(), kind, details))
+
+    def record_message(self, direction: str, msg: Any) -> None:
+        """Record a sent or received message with its payload.
+
+        The payload is kept as is and only summarized when dumped. The client
+        adds descriptors to the items of screen payloads and keeps those items as
+        its entries, so a dump shows them without the descriptors but with the
+        values they have at that time.
+        """
+        self._events.append(
+            (time.monotonic(), direction, (msg.type_int, msg.mc, msg.ref, msg.payload))
+        )
+
+    def __len__(self) -> int:
+        """Return the number of recorded events."""
+        return len(self._events)
+
+    def dump(self, redact: Callable[[Any], Any]) -> list[dict[str, Any]]:
+        """Return the recorded events, oldest first, with redacted payloads."""
+        now = time.monotonic()
+        return [
+            {
+                "age": round(now - recorded, 3),
+                "kind": kind,
+                "details": [_format_detail(detail, redact) for detail in details],
+            }
+            for recorded, kind, details in self._events
+        ]
+
+
+def _summarize(value: Any, depth: int) -> Any:
+    """Return a copy of value, with containers below depth replaced by their size.
+
+    Fields the client added to payload items start with an underscore and are
+    left out.
+    """
+    if isinstance(value, dict):
+        if not depth:
+            return f"<{len(value)} fields>"
+        return {
+            field: _summarize(item, depth - 1)
+            for field, item in value.items()
+            if not field.startswith("_")
+        }
+    if isinstance(value, list):
+        if not depth:
+            return f"<{len(value)} items>"
+        return [_summarize(item, depth - 1) for item in value]
+    return value
+
+
+def _format_detail(detail: Any, redact: Callable[[Any], Any]) -> Any:
+    """Return a JSON serializable form of a recorded detail."""
+    if isinstance(detail, (dict, list)):
+        return redact(_summarize(detail, SUMMARY_DEPTH))
+    if isinstance(detail, tuple):
+        return list(detail)
+    if detail is None or isinstance(detail, (int, float, str)):
+        return detail
+    return repr(detail)
+
+
+class LogRateLimiter:
+    """Allow at most per_second log lines per second, counting the rest."""
+
+    def __init__(self, per_second: int) -> None:
+        """Initialize the limiter."""
+        self.per_second = per_second
+        self._second = 0
+        self._count = 0
+        self.dropped = 0
+
+    def allow(self) -> bool:
+        """Return whether another line may be logged in the current second."""
+        second = int(time.monotonic())
+        if second != self._second:
+            self._second = second
+            self._count = 0
+        self._count += 1
+        if self._count > self.per_second:
+            self.dropped += 1
+            return False
+        return True
@@ -0,0 +1,67 @@
+"""Hand-off of the connection validated by the config flow to the entry.
+
+The config flow has to connect and log in to validate the credentials. Instead
+of closing that connection and repeating the slow secure handshake seconds
+later, it is parked here for the connection loop of the entry to pick up.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import DOMAIN, HANDOFF_TTL, LOGGER
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from homeassistant.core import HomeAssistant
+
+    from .connection import HarreitherConnection
+
+DATA_HANDOFF = f"{DOMAIN}_handoff"
+
+
+@callback
+def async_park_connection(
+    hass: HomeAssistant,
+    ws_url: str,
+    username: str,
+    conn_obj: HarreitherConnection,
+) -> None:
+    """Keep a logged in connection for HANDOFF_TTL seconds, then close it."""
+    handoffs: dict[tuple, tuple[HarreitherConnection, Callable]] = hass.data.setdefault(
+        DATA_HANDOFF, {}
+    )
+    key = (ws_url, username)
+    if (parked := handoffs.pop(key, None)) is not None:
+        parked[1]()
+        hass.async_create_task(parked[0].async_close())
+
+    @callback
+    def _async_expire(_now) -> None:
+        if handoffs.get(key, (None,))[0] is conn_obj:
+            del handoffs[key]
+            LOGGER.debug("Closing unused validated connection to %s", ws_url)
+            hass.async_create_task(conn_obj.async_close())
+
+    handoffs[key] = (conn_obj, async_call_later(hass, HANDOFF_TTL, _async_expire))
+
+
+@callback
+def async_take_parked_connection(
+    hass: HomeAssistant,
+    ws_url: str,
+    username: str,
+) -> HarreitherConnection | None:
+    """Return the parked connection for ws_url and username, if still open."""
+    parked = hass.data.get(DATA_HANDOFF, {}).pop((ws_url, username), None)
+    if parked is None:
+        return None
+    conn_obj, cancel_expiry = parked
+    cancel_expiry()
+    if conn_obj.ws is None:
+        return None
+    return conn_obj
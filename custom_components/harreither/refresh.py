@@ -0,0 +1,94 @@
+"""Background screen refresh for harreither.
+
+The controller only pushes values of the screen it currently shows. After the
+initial traversal, the refresher cycles through the screens of the integration's
+entities, so values on other screens do not go stale.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import TYPE_CHECKING
+
+from .const import LOGGER, REFRESH_BACKOFF, REFRESH_COLD_FACTOR
+from .scheduler import PRIORITY_AUTOMATION, PRIORITY_INTERACTIVE
+
+if TYPE_CHECKING:
+    from .connection import HarreitherConnection
+    from .data import HarreitherConfigEntry
+
+
+class ScreenRefresher:
+    """Round-robin refresh of screens, most overdue first.
+
+    Screens whose values changed within the last cold interval are refreshed
+    every interval, other screens REFRESH_COLD_FACTOR times less often. Screens
+    whose entities are all disabled are skipped.
+    """
+
+    def __init__(
+        self,
+        entry: HarreitherConfigEntry,
+        conn_obj: HarreitherConnection,
+        interval: float,
+    ) -> None:
+        """Initialize the refresher."""
+        self._entry = entry
+        self._conn_obj = conn_obj
+        self._interval = interval
+        self._cold_interval = interval * REFRESH_COLD_FACTOR
+        self._last_visit: dict[tuple, float] = {}
+        self._started = time.monotonic()
+
+    def _next_screen(self, now: float) -> tuple[tuple | None, float]:
+        """Return the most overdue screen and the time it is due."""
+        enabled_screens: dict[tuple, bool] = {}
+        for entity in self._entry.runtime_data.entities.values():
+            if entity._data_entry is None:
+                continue
+            screen_key = entity._data_entry["_screen_key"]
+            enabled_screens[screen_key] = (
+                enabled_screens.get(screen_key, False) or entity.enabled
+            )
+
+        screen_activity = self._entry.runtime_data.screen_activity
+        next_screen, next_due = None, float("inf")
+        for screen_key, enabled in enabled_screens.items():
+            if not enabled:
+                continue
+            recently_changed = (
+                screen_activity.get(screen_key, 0) > now - self._cold_interval
+            )
+            cadence = self._interval if recently_changed else self._cold_interval
+            # Traversal has just shown every screen, so start counting from there
+            due = self._last_visit.get(screen_key, self._started) + cadence
+            if due < next_due:
+                next_screen, next_due = screen_key, due
+        return next_screen, next_due
+
+    async def async_run(self) -> None:
+        """Refresh screens until cancelled or the connection closes."""
+        scheduler = self._conn_obj.scheduler
+        LOGGER.debug("Starting screen refresh every %s s", self._interval)
+        while True:
+            if scheduler.pending(PRIORITY_INTERACTIVE) or scheduler.pending(
+                PRIORITY_AUTOMATION
+            ):
+                await asyncio.sleep(REFRESH_BACKOFF)
+                continue
+
+            now = time.monotonic()
+            screen_key, due = self._next_screen(now)
+            if screen_key is None:
+                await asyncio.sleep(self._interval)
+                continue
+            if due > now:
+                await asyncio.sleep(due - now)
+                continue
+
+            self._last_visit[screen_key] = now
+            try:
+                await self._conn_obj.async_refresh_screen(screen_key)
+            except ConnectionError:
+                return
@@ -0,0 +1,169 @@
+"""Prioritized, rate-limited command scheduler for controller traffic."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from .const import LOGGER
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Hashable
+
+# Priority classes, lower values are sent first
+PRIORITY_INTERACTIVE = 0  # Writes initiated by a user from the UI
+PRIORITY_AUTOMATION = 1  # Writes from automations, scripts and services
+PRIORITY_BACKGROUND = 2  # Screen traversal and refresh traffic
+
+PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: "interactive",
+    PRIORITY_AUTOMATION: "automation",
+    PRIORITY_BACKGROUND: "background",
+}
+
+
+class TokenBucket:
+    """Token bucket limiting the rate of messages sent to the controller."""
+
+    def __init__(self, rate: float, burst: int) -> None:
+        """Initialize the bucket with rate tokens per second and burst capacity."""
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = asyncio.get_running_loop().time()
+        self.throttled = 0  # Number of times a message had to wait for a token
+
+    async def async_acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        loop = asyncio.get_running_loop()
+        while True:
+            now = loop.time()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            self.throttled += 1
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+@dataclass(order=True)
+class _Command:
+    """A unit of controller traffic that runs without interleaving."""
+
+    priority: int
+    seq: int
+    run: Callable[[], Awaitable[Any]] = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    dedupe_key: Hashable | None = field(compare=False, default=None)
+    superseded: bool = field(compare=False, default=False)
+
+
+class CommandScheduler:
+    """Run submitted commands one at a time, highest priority first.
+
+    A command submitted with the dedupe_key of a command that is still queued
+    supersedes it; both callers receive the result of the newer command.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        """Initialize the scheduler."""
+        self.bucket = TokenBucket(rate, burst)
+        self._queue: list[_Command] = []
+        self._queued_by_key: dict[Hashable, _Command] = {}
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._depths = dict.fromkeys(PRIORITY_NAMES, 0)
+        self.max_depths = dict.fromkeys(PRIORITY_NAMES, 0)
+        self.submitted = 0
+        self.completed = 0
+        self.superseded = 0
+
+    def queue_depths(self) -> dict[str, int]:
+        """Return the number of queued commands per priority class."""
+        return {PRIORITY_NAMES[p]: depth for p, depth in self._depths.items()}
+
+    def pending(self, priority: int) -> int:
+        """Return the number of queued commands of a priority class."""
+        return self._depths[priority]
+
+    async def async_submit(
+        self,
+        priority: int,
+        run: Callable[[], Awaitable[Any]],
+        dedupe_key: Hashable | None = None,
+    ) -> Any:
+        """Queue a command and wait for its result."""
+        future = asyncio.get_running_loop().create_future()
+        if dedupe_key is not None and (old := self._queued_by_key.get(dedupe_key)):
+            old.superseded = True
+            self._depths[old.priority] -= 1
+            self.superseded += 1
+            future = old.future
+            priority = min(priority, old.priority)
+
+        command = _Command(priority, next(self._seq), run, future, dedupe_key)
+        heapq.heappush(self._queue, command)
+        if dedupe_key is not None:
+            self._queued_by_key[dedupe_key] = command
+        self._depths[priority] += 1
+        self.max_depths[priority] = max(
+            self.max_depths[priority], self._depths[priority]
+        )
+        self.submitted += 1
+        self._wakeup.set()
+        return await asyncio.shield(future)
+
+    async def async_throttle(self) -> None:
+        """Wait for the rate limit before sending a single message."""
+        await self.bucket.async_acquire()
+
+    async def async_run(self) -> None:
+        """Execute queued commands until cancelled."""
+        try:
+            while True:
+                if not self._queue:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+
+                command = heapq.heappop(self._queue)
+                if command.superseded:
+                    continue
+                self._depths[command.priority] -= 1
+                if command.dedupe_key is not None:
+                    self._queued_by_key.pop(command.dedupe_key, None)
+                if command.future.done():
+                    continue
+
+                try:
+                    result = await command.run()
+                except asyncio.CancelledError:
+                    command.future.set_exception(
+                        ConnectionError("Connection closed before command completed")
+                    )
+                    raise
+                except Exception as err:  # noqa: BLE001
+                    LOGGER.debug("Command failed: %s", err)
+                    command.future.set_exception(err)
+                else:
+                    command.future.set_result(result)
+                self.completed += 1
+        finally:
+            self._fail_queued()
+
+    def _fail_queued(self) -> None:
+        """Fail all queued commands, the connection they were meant for is gone."""
+        for command in self._queue:
+            if not command.superseded and not command.future.done():
+                command.future.set_exception(
+                    ConnectionError("Connection closed before command was sent")
+                )
+        self._queue.clear()
+        self._queued_by_key.clear()
+        self._depths = dict.fromkeys(PRIORITY_NAMES, 0)
@@ -5,27 +5,34 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.select import SelectEntity, SelectEntityDescription
+from homeassistant.const import Platform
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.entity_platform import async_get_current_platform
 
 from .const import LOGGER
+from .entity import HarreitherEntity
+from .scheduler import PRIORITY_AUTOMATION, PRIORITY_INTERACTIVE
 
 if TYPE_CHECKING:
-    from homeassistant.core import HomeAssistant
+    from homeassistant.core import HomeAssistant, State
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
     from .brain import Entry
+    from .data import HarreitherConfigEntry
 
 
 async def async_setup_entry(
     hass: HomeAssistant,
-    entry: Any,
+    entry: HarreitherConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the select platform."""
-    # Entity creation is handled in __init__.py after initialization completes
-    pass
+    # Entity creation is handled in __init__.py as the controller reports entries,
+    # through the platform of this config entry
+    entry.runtime_data.platform_dict[Platform.SELECT] = async_get_current_platform()
 
 
-class HarreitherInputSelect(SelectEntity):
+class HarreitherInputSelect(HarreitherEntity, SelectEntity):
     """Harreither Select entity."""
 
     entity_description: SelectEntityDescription
@@ -42,6 +49,7 @@ class HarreitherInputSelect(SelectEntity):
         self.entity_description = entity_description
         self._attr_unique_id = f"{entry_id}-{entity_key}"
         self._attr_has_entity_name = True
+        self._entity_key = entity_key
         self._data_entry: Entry = data_entry
         self._runtime_data = runtime_data
 
@@ -57,25 +65,38 @@ class HarreitherInputSelect(SelectEntity):
 
     async def async_select_option(self, option: str) -> None:
         """Change the selected option."""
+        connection = self._runtime_data.connection
+        if connection is None:
+            raise HomeAssistantError(
+                f"{self.entity_description.name} cannot be set while the "
+                "controller is disconnected"
+            )
         if option in self.entity_description.options:
             # Get the index of the selected option
             option_index = self.entity_description.options.index(option)
+            previous_option = self._attr_current_option
             self._attr_current_option = option
             self.async_write_ha_state()
+            # The option is shown before the controller confirms it, so the next
+            # push must be written even if it repeats the index cached before
+            self._runtime_data.last_values.pop(self._entity_key, None)
             LOGGER.info("Select %s set to %s", self.entity_description.name, option)
 
-            connection = self._runtime_data.connection
-
-            # First, navigate to the correct screen
-            # this might not be necesseary, but we don't know...
-            screen_msg = self._data_entry.message_activate_entering_screen()
-            screen_ack = await connection.enqueue_message_get_ack(screen_msg)
-            LOGGER.debug("Received ACK for ACTUAL_SCREEN: %s", screen_ack)
-
-            # Then, send the ACTION_EDITED_VALUE message to change the value
-            msg = self._data_entry.message_edit_value(option_index)
-            ack = await connection.enqueue_message_get_ack(msg)
-            LOGGER.debug("Received ACK for select change: %s", ack)
+            # Changes made by a user in the UI go ahead of automation writes
+            priority = (
+                PRIORITY_INTERACTIVE
+                if self._context is not None and self._context.user_id
+                else PRIORITY_AUTOMATION
+            )
+            # Navigation to the entry's screen is skipped when it is already active
+            if not await connection.async_write_value(
+                self._data_entry, option_index, priority=priority
+            ):
+                self._attr_current_option = previous_option
+                self.async_write_ha_state()
+                raise HomeAssistantError(
+                    f"Controller rejected {option} for {self.entity_description.name}"
+                )
         else:
             LOGGER.warning(
                 "Option %s not in available options for %s",
@@ -83,14 +104,21 @@ class HarreitherInputSelect(SelectEntity):
                 self.entity_description.name,
             )
 
-    def update_state(self, value: int) -> None:
-        """Update select state and write to Home Assistant."""
+    def restore_last_state(self, last_state: State) -> bool:
+        """Restore the last option, if it still exists."""
+        if last_state.state not in self.entity_description.options:
+            return False
+        self._attr_current_option = last_state.state
+        return True
+
+    def update_state(self, value: int) -> bool:
+        """Update select state, return whether it was written to Home Assistant."""
         if isinstance(value, int) and 0 <= value < len(self.entity_description.options):
             self._attr_current_option = self.entity_description.options[value]
-            self.async_write_ha_state()
-        else:
-            LOGGER.warning(
-                "Invalid index %s for select %s",
-                value,
-                self.entity_description.name,
-            )
+            return self._async_write_state()
+        LOGGER.warning(
+            "Invalid index %s for select %s",
+            value,
+            self.entity_description.name,
+        )
+        return False
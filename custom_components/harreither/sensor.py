@@ -2,23 +2,102 @@
 
 from __future__ import annotations
 
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import timedelta
 from typing import TYPE_CHECKING, Any, cast
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
     SensorEntityDescription,
+    SensorStateClass,
 )
-from homeassistant.const import UnitOfTemperature
+from homeassistant.const import (
+    CONF_HOST,
+    EntityCategory,
+    Platform,
+    UnitOfTemperature,
+    UnitOfTime,
+)
+from homeassistant.core import callback
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.entity_platform import async_get_current_platform
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.typing import StateType
 
-from .const import LOGGER
-from .data import HarreitherConfigEntry
+from .const import DOMAIN, HEALTH_UPDATE_INTERVAL, LOGGER
+from .data import HarreitherConfigEntry, HarreitherData
+from .entity import HarreitherEntity
 
 if TYPE_CHECKING:
-    from homeassistant.core import HomeAssistant
+    from homeassistant.core import HomeAssistant, State
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
+# Key of the system time the controller pushes every second
+SYSTEM_TIME_KEY = (317, 1, None)
+
+
+def _seconds_since_ping(data: HarreitherData) -> float | None:
+    """Return the seconds since the controller last pushed its system time."""
+    stats = data.key_stats.get(SYSTEM_TIME_KEY)
+    if stats is None or data.connection is None:
+        return None
+    return round(time.monotonic() - stats.last_update, 1)
+
+
+@dataclass(frozen=True, kw_only=True)
+class HarreitherHealthSensorEntityDescription(SensorEntityDescription):
+    """Describes a connection health sensor."""
+
+    value_fn: Callable[[HarreitherData], StateType]
+
+
+HEALTH_SENSORS: tuple[HarreitherHealthSensorEntityDescription, ...] = (
+    HarreitherHealthSensorEntityDescription(
+        key="ack_rtt_p50",
+        name="Ack round trip p50",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda data: data.stats.ack_rtt.percentile(50),
+    ),
+    HarreitherHealthSensorEntityDescription(
+        key="ack_rtt_p95",
+        name="Ack round trip p95",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda data: data.stats.ack_rtt.percentile(95),
+    ),
+    HarreitherHealthSensorEntityDescription(
+        key="inbound_rate",
+        name="Inbound messages",
+        native_unit_of_measurement="msg/s",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda data: data.stats.inbound.rate(),
+    ),
+    HarreitherHealthSensorEntityDescription(
+        key="dispatch_queue_depth",
+        name="Dispatch queue depth",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda data: len(data.connection.updates) if data.connection else 0,
+    ),
+    HarreitherHealthSensorEntityDescription(
+        key="seconds_since_ping",
+        name="Time since system time ping",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_seconds_since_ping,
+    ),
+    HarreitherHealthSensorEntityDescription(
+        key="reconnects",
+        name="Reconnects",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda data: data.stats.reconnects,
+    ),
+)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -26,11 +105,28 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the sensor platform."""
-    # Entity creation is now handled in __init__.py after initialization completes
-    pass
+    # Entity creation is handled in __init__.py as the controller reports entries,
+    # through the platform of this config entry
+    entry.runtime_data.platform_dict[Platform.SENSOR] = async_get_current_platform()
+
+    health_sensors = [
+        HarreitherHealthSensor(entry, description) for description in HEALTH_SENSORS
+    ]
+    async_add_entities(health_sensors)
+
+    @callback
+    def _async_update_health(_now) -> None:
+        for sensor in health_sensors:
+            sensor.async_update_value()
+
+    entry.async_on_unload(
+        async_track_time_interval(
+            hass, _async_update_health, timedelta(seconds=HEALTH_UPDATE_INTERVAL)
+        )
+    )
 
 
-class HarreitherSensor(SensorEntity):
+class HarreitherSensor(HarreitherEntity, SensorEntity):
     """Harreither Sensor class."""
 
     def __init__(
@@ -51,13 +147,21 @@ class HarreitherSensor(SensorEntity):
         """Return the native value of the sensor."""
         return cast(StateType, self._attr_native_value)
 
-    def update_state(self, value: float) -> None:
-        """Update sensor state and write to Home Assistant."""
+    def restore_last_state(self, last_state: State) -> bool:
+        """Restore the last numeric value."""
+        try:
+            self._attr_native_value = float(last_state.state)
+        except ValueError:
+            return False
+        return True
+
+    def update_state(self, value: float) -> bool:
+        """Update sensor state, return whether it was written to Home Assistant."""
         self._attr_native_value = value
-        self.async_write_ha_state()
+        return self._async_write_state()
 
 
-class HarreitherEnumSensor(SensorEntity):
+class HarreitherEnumSensor(HarreitherEntity, SensorEntity):
     """Harreither Enum Sensor class."""
 
     def __init__(
@@ -102,18 +206,62 @@ class HarreitherEnumSensor(SensorEntity):
         else:
             current_index = 0
         return {
+            **(super().extra_state_attributes or {}),
             "current_index": current_index,
         }
 
-    def update_state(self, value: int) -> None:
-        """Update enum sensor state from device and write to Home Assistant."""
+    def restore_last_state(self, last_state: State) -> bool:
+        """Restore the last option, if it still exists."""
+        if last_state.state not in self._options:
+            return False
+        self._attr_native_value = last_state.state
+        return True
+
+    def update_state(self, value: int) -> bool:
+        """Update enum sensor state from device, return whether it was written."""
         if isinstance(value, int) and 0 <= value < len(self._options):
             self._attr_native_value = self._options[value]
+            return self._async_write_state()
+        LOGGER.warning(
+            "Invalid value %s for enum sensor %s (valid range: 0-%s)",
+            value,
+            self.name,
+            len(self._options) - 1,
+        )
+        return False
+
+
+class HarreitherHealthSensor(SensorEntity):
+    """Diagnostic sensor reading an in-memory connection counter."""
+
+    entity_description: HarreitherHealthSensorEntityDescription
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        entry: HarreitherConfigEntry,
+        entity_description: HarreitherHealthSensorEntityDescription,
+    ) -> None:
+        """Initialize the health sensor."""
+        self.entity_description = entity_description
+        self._runtime_data = entry.runtime_data
+        self._attr_unique_id = f"{entry.entry_id}-health-{entity_description.key}"
+        # One device per controller keeps the sensors of several controllers apart
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry.entry_id)},
+            manufacturer="Harreither",
+            model="Brain",
+            name=f"Harreither Brain {entry.data[CONF_HOST]}",
+        )
+        self._attr_native_value = entity_description.value_fn(entry.runtime_data)
+
+    @callback
+    def async_update_value(self) -> None:
+        """Read the counter and write the state if it changed."""
+        value = self.entity_description.value_fn(self._runtime_data)
+        if value != self._attr_native_value:
+            self._attr_native_value = value
             self.async_write_ha_state()
-        else:
-            LOGGER.warning(
-                "Invalid value %s for enum sensor %s (valid range: 0-%s)",
-                value,
-                self.name,
-                len(self._options) - 1,
-            )
@@ -0,0 +1,186 @@
+"""Services for harreither."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import entity_registry as er
+
+from .const import DOMAIN
+from .scheduler import PRIORITY_AUTOMATION
+
+if TYPE_CHECKING:
+    from .brain import Entry
+    from .data import HarreitherConfigEntry
+
+SERVICE_SET_VALUES = "set_values"
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_KEY = "key"
+ATTR_VALUE = "value"
+ATTR_VALUES = "values"
+
+SET_VALUES_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_VALUES): vol.All(
+            cv.ensure_list,
+            [
+                vol.All(
+                    {
+                        vol.Exclusive(ATTR_ENTITY_ID, "target"): cv.entity_id,
+                        vol.Exclusive(ATTR_KEY, "target"): vol.All(
+                            cv.ensure_list, vol.Length(min=3, max=3)
+                        ),
+                        vol.Required(ATTR_VALUE): vol.Any(int, cv.string),
+                    },
+                    cv.has_at_least_one_key(ATTR_ENTITY_ID, ATTR_KEY),
+                )
+            ],
+        ),
+    }
+)
+
+
+def _loaded_entries(hass: HomeAssistant) -> list[HarreitherConfigEntry]:
+    """Return all loaded Harreither config entries."""
+    return [
+        entry
+        for entry in hass.config_entries.async_entries(DOMAIN)
+        if entry.state is ConfigEntryState.LOADED
+    ]
+
+
+def _resolve_entity_id(
+    hass: HomeAssistant, entity_id: str
+) -> tuple[HarreitherConfigEntry, Entry, list[str] | None]:
+    """Return config entry, Entry and select options of a Harreither entity."""
+    registry_entry = er.async_get(hass).async_get(entity_id)
+    config_entry = (
+        hass.config_entries.async_get_entry(registry_entry.config_entry_id)
+        if registry_entry and registry_entry.platform == DOMAIN
+        else None
+    )
+    if config_entry is None or config_entry.state is not ConfigEntryState.LOADED:
+        raise ServiceValidationError(f"{entity_id} is not a loaded {DOMAIN} entity")
+
+    for entity in config_entry.runtime_data.entities.values():
+        if entity.entity_id == entity_id:
+            description = getattr(entity, "entity_description", None)
+            options = getattr(description, "options", None)
+            return config_entry, entity._data_entry, options
+    raise ServiceValidationError(f"{entity_id} is not a loaded {DOMAIN} entity")
+
+
+def _resolve_key(
+    hass: HomeAssistant, call: ServiceCall, key: list
+) -> tuple[HarreitherConfigEntry, Entry, None]:
+    """Return config entry and Entry of a raw controller key."""
+    entries = _loaded_entries(hass)
+    if config_entry_id := call.data.get(ATTR_CONFIG_ENTRY_ID):
+        entries = [entry for entry in entries if entry.entry_id == config_entry_id]
+    if len(entries) != 1:
+        raise ServiceValidationError(
+            f"Writing raw keys requires {ATTR_CONFIG_ENTRY_ID} of a loaded entry"
+        )
+
+    config_entry = entries[0]
+    connection = config_entry.runtime_data.connection
+    data_entry = connection.entries.get_entry(tuple(key)) if connection else None
+    if data_entry is None:
+        raise ServiceValidationError(f"Controller key {key} is not known")
+    return config_entry, data_entry, None
+
+
+def _resolve_value(item: dict[str, Any], options: list[str] | None) -> int:
+    """Return the numeric value to write, mapping select options to their index."""
+    value = item[ATTR_VALUE]
+    if isinstance(value, bool):
+        raise ServiceValidationError(f"Invalid value {value!r}")
+    if isinstance(value, str) and options and value in options:
+        return options.index(value)
+    try:
+        index = int(value)
+    except ValueError:
+        raise ServiceValidationError(f"Invalid value {value!r}") from None
+    if options and not 0 <= index < len(options):
+        raise ServiceValidationError(
+            f"Value {value!r} is not an index of the {len(options)} options"
+        )
+    return index
+
+
+async def _async_handle_set_values(call: ServiceCall) -> ServiceResponse:
+    """Write several controller values, grouped by screen per controller."""
+    hass = call.hass
+    batches: dict[str, list[tuple[int, Entry, int]]] = {}
+    config_entries: dict[str, HarreitherConfigEntry] = {}
+    items = call.data[ATTR_VALUES]
+
+    # Validate everything first, so an invalid item does not half-apply a scene
+    for index, item in enumerate(items):
+        if ATTR_ENTITY_ID in item:
+            config_entry, data_entry, options = _resolve_entity_id(
+                hass, item[ATTR_ENTITY_ID]
+            )
+        else:
+            config_entry, data_entry, options = _resolve_key(hass, call, item[ATTR_KEY])
+        if data_entry is None or data_entry.get("edit") is not True:
+            raise ServiceValidationError(f"Item {index + 1} is not editable")
+        if config_entry.runtime_data.connection is None:
+            raise HomeAssistantError(f"{config_entry.title} is not connected")
+
+        config_entries[config_entry.entry_id] = config_entry
+        batches.setdefault(config_entry.entry_id, []).append(
+            (index, data_entry, _resolve_value(item, options))
+        )
+
+    async def _async_write_batch(entry_id: str) -> list[bool]:
+        connection = config_entries[entry_id].runtime_data.connection
+        return await connection.async_write_values(
+            [(data_entry, value) for _, data_entry, value in batches[entry_id]],
+            priority=PRIORITY_AUTOMATION,
+        )
+
+    entry_ids = list(batches)
+    batch_results = await asyncio.gather(
+        *(_async_write_batch(entry_id) for entry_id in entry_ids),
+        return_exceptions=True,
+    )
+
+    results: list[dict[str, Any]] = [{} for _ in items]
+    for entry_id, outcome in zip(entry_ids, batch_results):
+        for position, (index, _, _) in enumerate(batches[entry_id]):
+            result = {**items[index], "success": False}
+            if isinstance(outcome, BaseException):
+                result["error"] = str(outcome)
+            else:
+                result["success"] = outcome[position]
+            results[index] = result
+
+    return {"results": results}
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the Harreither services."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_VALUES,
+        _async_handle_set_values,
+        schema=SET_VALUES_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
@@ -0,0 +1,181 @@
+"""In-memory performance counters of a controller connection.
+
+All counters are updated in O(1) per event and kept across reconnects, so they
+can be read by diagnostics at any time.
+"""
+
+from __future__ import annotations
+
+import bisect
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any
+
+# Upper bounds in milliseconds of the latency histogram buckets
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# Seconds of per-second message counts kept for the inbound rate
+RATE_WINDOW = 60
+
+
+class LatencyHistogram:
+    """Histogram of durations with fixed millisecond buckets."""
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Add a duration in seconds."""
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS_MS, seconds * 1000)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, percent: float) -> float | None:
+        """Return the upper bound in milliseconds of the bucket holding a percentile.
+
+        Durations beyond the last bucket are reported as the largest duration.
+        """
+        if not self.count:
+            return None
+        rank = self.count * percent / 100
+        seen = 0
+        for bound, bucket_count in zip(LATENCY_BUCKETS_MS, self.buckets):
+            seen += bucket_count
+            if seen >= rank:
+                return bound
+        return round(self.max * 1000, 1)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histogram for diagnostics."""
+        labels = [f"<={bound}ms" for bound in LATENCY_BUCKETS_MS]
+        labels.append(f">{LATENCY_BUCKETS_MS[-1]}ms")
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 2) if self.count else None,
+            "max_ms": round(self.max * 1000, 2),
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "buckets": dict(zip(labels, self.buckets)),
+        }
+
+
+class RateCounter:
+    """Count events per second over the last RATE_WINDOW seconds."""
+
+    def __init__(self) -> None:
+        """Initialize the counter."""
+        self._counts = [0] * RATE_WINDOW
+        self._second = int(time.monotonic())
+        self.total = 0
+
+    def _advance(self, second: int) -> None:
+        """Clear the slots of the seconds that passed without events."""
+        last = min(second, self._second + RATE_WINDOW)
+        for passed in range(self._second + 1, last + 1):
+            self._counts[passed % RATE_WINDOW] = 0
+        self._second = max(self._second, second)
+
+    def record(self) -> None:
+        """Count one event."""
+        second = int(time.monotonic())
+        if second != self._second:
+            self._advance(second)
+        self._counts[second % RATE_WINDOW] += 1
+        self.total += 1
+
+    def rate(self) -> float:
+        """Return the events per second over the last full window."""
+        self._advance(int(time.monotonic()))
+        return round(
+            (sum(self._counts) - self._counts[self._second % RATE_WINDOW])
+            / (RATE_WINDOW - 1),
+            2,
+        )
+
+
+@dataclass(slots=True)
+class KeyStats:
+    """Traffic counters of a single controller key."""
+
+    first_update: float  # Monotonic time of the first update
+    last_update: float = 0.0  # Monotonic time of the last update
+    received: int = 0  # Updates reported by the controller
+    changed: int = 0  # Updates whose value differed from the previous one
+    written: int = 0  # State writes issued to Home Assistant
+    last_value: Any = None
+
+    def record_update(self, now: float, value: Any) -> None:
+        """Count an update of the key."""
+        if self.received and value != self.last_value:
+            self.changed += 1
+        self.received += 1
+        self.last_update = now
+        self.last_value = value
+
+    def rate(self, now: float) -> float:
+        """Return the updates per second since the first update."""
+        return self.received / max(now - self.first_update, 1.0)
+
+
+def hot_keys(
+    key_stats: dict[tuple, KeyStats], limit: int
+) -> list[tuple[tuple, KeyStats, float]]:
+    """Return the limit keys with the highest update rate, with their rate."""
+    now = time.monotonic()
+    rated = [(key, stats, stats.rate(now)) for key, stats in key_stats.items()]
+    rated.sort(key=lambda item: item[2], reverse=True)
+    return rated[:limit]
+
+
+@dataclass
+class ConnectionStats:
+    """Performance counters of the connection to one controller."""
+
+    phases: dict = field(
+        default_factory=dict
+    )  # Seconds spent in each phase of the last connection
+    ack_rtt: LatencyHistogram = field(
+        default_factory=LatencyHistogram
+    )  # Time from sending a message to its ACK/NACK
+    dispatch_time: LatencyHistogram = field(
+        default_factory=LatencyHistogram
+    )  # Time spent in the notify callbacks per update
+    inbound: RateCounter = field(default_factory=RateCounter)  # Received messages
+    reconnects: int = 0  # Number of connection attempts after the first
+    reconnect_causes: Counter = field(
+        default_factory=Counter
+    )  # Reconnects per exception type
+    last_reconnect_cause: str | None = None  # Exception that caused the last reconnect
+
+    def record_phase(self, phase: str, seconds: float) -> None:
+        """Store the duration of a connection phase."""
+        self.phases[phase] = round(seconds, 3)
+
+    def add_phase(self, phase: str, seconds: float) -> None:
+        """Add to the duration of a phase that runs in several parts."""
+        self.phases[phase] = round(self.phases.get(phase, 0) + seconds, 3)
+
+    def record_reconnect(self, err: BaseException) -> None:
+        """Count a reconnect and its cause."""
+        self.reconnects += 1
+        self.reconnect_causes[type(err).__name__] += 1
+        self.last_reconnect_cause = f"{type(err).__name__}: {err}"
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters for diagnostics."""
+        return {
+            "phases": self.phases,
+            "ack_rtt": self.ack_rtt.as_dict(),
+            "dispatch_time": self.dispatch_time.as_dict(),
+            "inbound_messages_total": self.inbound.total,
+            "inbound_messages_per_second": self.inbound.rate(),
+            "reconnects": self.reconnects,
+            "reconnect_causes": dict(self.reconnect_causes),
+            "last_reconnect_cause": self.last_reconnect_cause,
+        }
@@ -0,0 +1,83 @@
+"""Key-collapsing queue between websocket receive and update dispatch."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import TYPE_CHECKING
+
+from .const import LOGGER, UPDATE_DISPATCH_BATCH
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from .brain import Entry
+    from .stats import LatencyHistogram
+
+
+class UpdateQueue:
+    """Hold the latest pending update per key until the dispatcher takes it.
+
+    Putting never blocks, and a key that is already pending is updated in
+    place instead of queued again, so the backlog is bounded by the number of
+    keys rather than the number of messages. An update reporting a key as new
+    keeps that flag when later updates of the key are collapsed into it.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the queue."""
+        self._pending: dict[tuple, tuple[Entry, bool]] = {}
+        self._wakeup = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self.received = 0
+        self.collapsed = 0
+        self.dispatched = 0
+        self.max_depth = 0
+
+    def __len__(self) -> int:
+        """Return the number of keys with a pending update."""
+        return len(self._pending)
+
+    def put(self, key: tuple, entry: Entry, new: bool) -> None:
+        """Queue an update, replacing a pending update of the same key."""
+        self.received += 1
+        if (pending := self._pending.get(key)) is not None:
+            self.collapsed += 1
+            new = new or pending[1]
+        self._pending[key] = (entry, new)
+        self.max_depth = max(self.max_depth, len(self._pending))
+        self._idle.clear()
+        self._wakeup.set()
+
+    async def async_wait_idle(self) -> None:
+        """Wait until all queued updates have been dispatched."""
+        await self._idle.wait()
+
+    async def async_run(
+        self,
+        handler: Callable[[tuple, Entry, bool], Awaitable[None]],
+        dispatch_time: LatencyHistogram,
+    ) -> None:
+        """Dispatch queued updates in arrival order until cancelled.
+
+        The loop yields after every UPDATE_DISPATCH_BATCH updates, so that a
+        large backlog does not keep the websocket reader waiting. The time
+        spent in handler is recorded in dispatch_time.
+        """
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            batch, self._pending = self._pending, {}
+            for count, (key, (entry, new)) in enumerate(batch.items(), 1):
+                started = time.monotonic()
+                try:
+                    await handler(key, entry, new)
+                except Exception:  # noqa: BLE001
+                    LOGGER.exception("Failed to dispatch update of %s", key)
+                dispatch_time.record(time.monotonic() - started)
+                self.dispatched += 1
+                if count % UPDATE_DISPATCH_BATCH == 0:
+                    await asyncio.sleep(0)
+            if not self._pending:
+                self._idle.set()
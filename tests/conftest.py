@@ -1,15 +1,27 @@
 """Test configuration for Harreither integration."""
 
+import asyncio
+import base64
+import json
 import sys
 from pathlib import Path
-from unittest.mock import AsyncMock, patch
+from typing import TYPE_CHECKING
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import padding, rsa
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from harreither_brain_client.authenticate import hash_device
 
+from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
 from homeassistant.core import HomeAssistant
 
 from tests.common import MockConfigEntry
 
+if TYPE_CHECKING:
+    from custom_components.harreither.brain import Entry
+
 # Add custom components path to sys.path
 CUSTOM_COMPONENTS_PATH = Path(__file__).parent.parent.parent.parent / "config"
 if str(CUSTOM_COMPONENTS_PATH) not in sys.path:
@@ -48,3 +60,185 @@ def mock_config_entry(hass: HomeAssistant) -> MockConfigEntry:
         title="test_user",
     )
     return mock_config_entry
+
+
+class FakeBrainSocket:
+    """Websocket of a controller that completes the handshake and the login.
+
+    After the login, screen changes are acknowledged right away. Value edits
+    are acknowledged in reverse order once ack_batch of them arrived. Edits of
+    VIDs in nack_vids, and edits while another screen than edit_screen is
+    shown, if set, are answered with a NACK.
+    """
+
+    def __init__(self, password: str, device_id: str = "brain-1") -> None:
+        """Initialize the socket with the first message of the controller."""
+        self.password = password
+        self.device_id = device_id
+        self.ack_batch = 1
+        self.nack_vids: set[int] = set()
+        self.screen: tuple | None = None
+        self.edit_screen: tuple | None = None
+        self._held_acks: list[dict] = []
+        self.transport = MagicMock()
+        self.closed = False
+        self.received: list[dict] = []
+        self._private_key = rsa.generate_private_key(
+            public_exponent=65537, key_size=2048
+        )
+        self._cipher: Cipher | None = None
+        self._outgoing: asyncio.Queue[bytes] = asyncio.Queue()
+        self._send_plain(
+            {"type_int": 10, "payload": {"device_id": device_id, "connection_id": 1}}
+        )
+
+    def _send_plain(self, data: dict) -> None:
+        self._outgoing.put_nowait(json.dumps(data).encode() + b"\x04")
+
+    def _send_encrypted(self, data: dict) -> None:
+        text = json.dumps(data).encode()
+        text += b"\x00" * (-len(text) % 16)
+        encryptor = self._cipher.encryptor()
+        encrypted = encryptor.update(text) + encryptor.finalize()
+        self._outgoing.put_nowait(base64.b64encode(encrypted) + b"\x04")
+
+    async def recv(self) -> bytes:
+        """Return the next message of the controller."""
+        return await self._outgoing.get()
+
+    async def send(self, message: str | bytes) -> None:
+        """Answer a message of the client."""
+        if isinstance(message, str):
+            data = json.loads(message.rstrip("\x04"))
+        else:
+            decryptor = self._cipher.decryptor()
+            encrypted = base64.b64decode(message.rstrip(b"\x04"))
+            text = decryptor.update(encrypted) + decryptor.finalize()
+            data = json.loads(text.rstrip(b"\x00"))
+        self.received.append(data)
+
+        type_int = data["type_int"]
+        if type_int == 11:
+            self._send_plain({"type_int": 12})
+        elif type_int == 14:
+            public_key = self._private_key.public_key().public_bytes(
+                serialization.Encoding.PEM,
+                serialization.PublicFormat.SubjectPublicKeyInfo,
+            )
+            self._send_plain(
+                {
+                    "type_int": 15,
+                    "payload": {
+                        "public_key": public_key.decode(),
+                        "device_signature": "signature",
+                    },
+                }
+            )
+        elif type_int == 16:
+            secret = self._private_key.decrypt(
+                base64.b64decode(data["payload"]["secret"]), padding.PKCS1v15()
+            )
+            key, iv = (bytes.fromhex(part) for part in secret.decode().split(":::"))
+            self._cipher = Cipher(algorithms.AES(key), modes.CBC(iv))
+            self._send_encrypted({"type_int": 17, "payload": {"sc_id": 1}})
+        elif type_int == 30:
+            payload = data["payload"]
+            expected = hash_device(self.device_id, self.password, payload["salt"])
+            if payload["password"] == expected["hash"]:
+                self._send_encrypted({"type_int": 32, "payload": {"token": "t"}})
+            else:
+                self._send_encrypted({"type_int": 31})
+        elif type_int in (200, 201):
+            if type_int == 200:
+                self.screen = (
+                    data["payload"]["screenID"],
+                    data["payload"].get("objID"),
+                )
+            self._send_encrypted({"type_int": 1, "ref": data["mc"]})
+        elif type_int == 202:
+            nack = data["payload"]["VID"] in self.nack_vids or (
+                self.edit_screen is not None and self.screen != self.edit_screen
+            )
+            self._held_acks.append({"type_int": 0 if nack else 1, "ref": data["mc"]})
+            if len(self._held_acks) >= self.ack_batch:
+                for ack in reversed(self._held_acks):
+                    self._send_encrypted(ack)
+                self._held_acks.clear()
+
+    async def close(self) -> None:
+        """Close the socket, a pending receive gets no more data."""
+        self.closed = True
+        self._outgoing.put_nowait(b"")
+
+
+@pytest.fixture
+def mock_brain() -> FakeBrainSocket:
+    """Connect websockets to a fake controller accepting test_password."""
+    socket = FakeBrainSocket("test_password")
+    with patch(
+        "harreither_brain_client.connection.websockets.connect",
+        AsyncMock(return_value=socket),
+    ):
+        yield socket
+
+
+SCREEN_KEY = (100, None)
+TEMPERATURE_VID_OBJ = {"type": 12, "unit": "°C", "text": "Temperature"}
+MODE_VID_OBJ = {
+    "type": 15,
+    "text": "Circuit",
+    "elements": [{"text": "Off"}, {"text": "Day"}, {"text": "Night"}],
+}
+
+
+def make_entry(
+    vid: int,
+    vid_obj: dict,
+    value=0,
+    edit: bool = False,
+    screen_key: tuple = SCREEN_KEY,
+) -> "Entry":
+    """Return an entry with detail 2 as reported by the controller."""
+    # Imported here, custom_components is only importable once sys.path is set up
+    from custom_components.harreither.brain import Entry
+
+    return Entry(
+        {
+            "VID": vid,
+            "detail": 2,
+            "name": f"Item {vid}",
+            "edit": edit,
+            "value": value,
+            "_vid_obj": vid_obj,
+            "_screen_key": screen_key,
+        }
+    )
+
+
+def make_connection() -> MagicMock:
+    """Return a connection stand-in that is still traversing screens."""
+    connection = MagicMock()
+    connection.entries.screens = {SCREEN_KEY: {"title": "Heating"}}
+    connection.event_initial_traverse_screens_complete.is_set.return_value = False
+    return connection
+
+
+async def async_setup_offline_entry(
+    hass: HomeAssistant, options: dict | None = None
+) -> MockConfigEntry:
+    """Set up an entry without a connection loop, with a traversing connection."""
+    entry = MockConfigEntry(
+        domain="harreither",
+        data={
+            CONF_HOST: "192.168.1.100",
+            CONF_USERNAME: "test_user",
+            CONF_PASSWORD: "test_password",
+        },
+        options=options or {},
+        unique_id="192.168.1.100",
+    )
+    entry.add_to_hass(hass)
+    with patch("custom_components.harreither._connection_loop", new_callable=AsyncMock):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+    entry.runtime_data.connection = make_connection()
+    return entry
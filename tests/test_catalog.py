@@ -0,0 +1,225 @@
+"""Catalog tests for the Harreither Integration."""
+
+import json
+from unittest.mock import AsyncMock, patch
+
+from homeassistant.const import (
+    CONF_HOST,
+    CONF_PASSWORD,
+    CONF_USERNAME,
+    STATE_UNAVAILABLE,
+)
+from homeassistant.core import HomeAssistant, State
+from homeassistant.helpers import entity_registry
+
+from custom_components.harreither import (
+    _async_notify_update_callback,
+    _async_sync_session,
+    async_mark_all_entries_unavailable,
+)
+from custom_components.harreither.catalog import (
+    CATALOG_STORAGE_VERSION,
+    build_catalog,
+    parse_catalog,
+)
+from custom_components.harreither.const import DOMAIN
+
+from tests.common import MockConfigEntry, mock_restore_cache
+from tests.conftest import (
+    MODE_VID_OBJ,
+    SCREEN_KEY,
+    TEMPERATURE_VID_OBJ,
+    async_setup_offline_entry,
+    make_connection,
+    make_entry,
+)
+
+MODE_KEY = (5, 2, None)
+TEMPERATURE_KEY = (7, 2, None)
+MODE_ENTITY_ID = "select.mode"
+TEMPERATURE_ENTITY_ID = "sensor.flow"
+
+
+def _make_catalog(device_id: str = "brain-1") -> dict:
+    """Return stored catalog data with a mode select and a temperature sensor."""
+    return {
+        "device_id": device_id,
+        "screens": [[*SCREEN_KEY, "Heating"]],
+        "entries": [
+            {
+                "VID": MODE_KEY[0],
+                "detail": MODE_KEY[1],
+                "name": "Mode",
+                "edit": True,
+                "value": 1,
+                "_vid_obj": MODE_VID_OBJ,
+                "_screen_key": list(SCREEN_KEY),
+            },
+            {
+                "VID": TEMPERATURE_KEY[0],
+                "detail": TEMPERATURE_KEY[1],
+                "name": "Flow",
+                "edit": False,
+                "value": 21.5,
+                "_vid_obj": TEMPERATURE_VID_OBJ,
+                "_screen_key": list(SCREEN_KEY),
+            },
+        ],
+    }
+
+
+async def _async_setup_restored_entry(
+    hass: HomeAssistant, hass_storage: dict, last_states: dict[str, str] | None = None
+) -> MockConfigEntry:
+    """Set up an entry whose catalog was stored by a previous run.
+
+    The catalog entities get the ids MODE_ENTITY_ID and TEMPERATURE_ENTITY_ID,
+    last_states maps those to the states Home Assistant saved before a restart.
+    """
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_HOST: "192.168.1.100",
+            CONF_USERNAME: "test_user",
+            CONF_PASSWORD: "test_password",
+        },
+        unique_id="192.168.1.100",
+    )
+    hass_storage[f"{DOMAIN}.catalog.{entry.entry_id}"] = {
+        "version": CATALOG_STORAGE_VERSION,
+        "minor_version": 1,
+        "key": f"{DOMAIN}.catalog.{entry.entry_id}",
+        "data": _make_catalog(),
+    }
+    entry.add_to_hass(hass)
+    registry = entity_registry.async_get(hass)
+    for entity_id, key in (
+        (MODE_ENTITY_ID, MODE_KEY),
+        (TEMPERATURE_ENTITY_ID, TEMPERATURE_KEY),
+    ):
+        domain, object_id = entity_id.split(".")
+        registry.async_get_or_create(
+            domain,
+            DOMAIN,
+            f"{entry.entry_id}-{key!r}",
+            suggested_object_id=object_id,
+            config_entry=entry,
+        )
+    mock_restore_cache(
+        hass,
+        [State(entity_id, state) for entity_id, state in (last_states or {}).items()],
+    )
+    with (
+        patch("custom_components.harreither._connection_loop", new_callable=AsyncMock),
+        patch("custom_components.harreither.async_assign_area_and_tags"),
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+    return entry
+
+
+async def test_catalog_round_trip(hass: HomeAssistant) -> None:
+    """Test a built catalog survives storage and parses back into entries."""
+    entry = await async_setup_offline_entry(hass)
+    for key, vid_obj, value in (
+        (MODE_KEY, MODE_VID_OBJ, 1),
+        (TEMPERATURE_KEY, TEMPERATURE_VID_OBJ, 21.5),
+    ):
+        await _async_notify_update_callback(
+            hass, entry, key, make_entry(key[0], vid_obj, value), True
+        )
+    connection = entry.runtime_data.connection
+    connection.device_id = "brain-1"
+
+    data = json.loads(
+        json.dumps(build_catalog(connection, entry.runtime_data.entities))
+    )
+    assert data["device_id"] == "brain-1"
+
+    screens, catalog_entries = parse_catalog(data)
+    assert screens == {SCREEN_KEY: {"screenID": 100, "objID": None, "title": "Heating"}}
+    assert [key for key, _ in catalog_entries] == [MODE_KEY, TEMPERATURE_KEY]
+    _, mode_entry = catalog_entries[0]
+    assert mode_entry["_screen_key"] == SCREEN_KEY
+    assert mode_entry["_vid_obj"] == MODE_VID_OBJ
+    assert mode_entry["value"] == 1
+
+
+async def test_setup_restores_catalog_entities(
+    hass: HomeAssistant, hass_storage: dict
+) -> None:
+    """Test entities of the stored catalog exist before the controller connects."""
+    entry = await _async_setup_restored_entry(hass, hass_storage)
+
+    runtime_data = entry.runtime_data
+    assert set(runtime_data.entities) == {repr(MODE_KEY), repr(TEMPERATURE_KEY)}
+    assert runtime_data.catalog_device_id == "brain-1"
+    assert MODE_KEY in runtime_data.dispatch
+    registry = entity_registry.async_get(hass)
+    for entity in runtime_data.entities.values():
+        assert entity.entity_id in registry.entities
+        assert not entity.available
+
+
+async def test_other_controller_drops_catalog(
+    hass: HomeAssistant, hass_storage: dict
+) -> None:
+    """Test a controller with another device id drops the restored entities."""
+    entry = await _async_setup_restored_entry(hass, hass_storage)
+    runtime_data = entry.runtime_data
+    mode_id = runtime_data.entities[repr(MODE_KEY)].entity_id
+    temperature_id = runtime_data.entities[repr(TEMPERATURE_KEY)].entity_id
+
+    conn_obj = runtime_data.connection = make_connection()
+    conn_obj.device_id = "brain-2"
+    conn_obj.session_started = None
+    conn_obj.event_initial_setup_complete.wait = AsyncMock()
+    conn_obj.event_initial_traverse_screens_complete.wait = AsyncMock()
+    conn_obj.updates.async_wait_idle = AsyncMock()
+    conn_obj.traversal_completed = False
+    # The new controller reported one of the keys during the initial setup
+    await _async_notify_update_callback(
+        hass, entry, MODE_KEY, make_entry(MODE_KEY[0], MODE_VID_OBJ, 2), True
+    )
+
+    with patch("custom_components.harreither.async_assign_area_and_tags"):
+        await _async_sync_session(hass, entry, conn_obj)
+    await hass.async_block_till_done()
+
+    registry = entity_registry.async_get(hass)
+    assert mode_id in registry.entities
+    assert temperature_id not in registry.entities
+    assert runtime_data.catalog_device_id is None
+    assert f"{DOMAIN}.catalog.{entry.entry_id}" not in hass_storage
+
+
+async def test_restored_state_stale_until_reported(
+    hass: HomeAssistant, hass_storage: dict
+) -> None:
+    """Test a restored state is flagged stale until the controller reports it."""
+    entry = await _async_setup_restored_entry(
+        hass,
+        hass_storage,
+        {MODE_ENTITY_ID: "Night", TEMPERATURE_ENTITY_ID: STATE_UNAVAILABLE},
+    )
+
+    state = hass.states.get(MODE_ENTITY_ID)
+    assert state.state == "Night"
+    assert state.attributes["stale"] is True
+    # A state that was not usable before the restart is not restored
+    assert hass.states.get(TEMPERATURE_ENTITY_ID).state == STATE_UNAVAILABLE
+
+    # Losing a connection keeps showing the restored state
+    async_mark_all_entries_unavailable(entry)
+    await hass.async_block_till_done()
+    assert hass.states.get(MODE_ENTITY_ID).state == "Night"
+
+    entry.runtime_data.connection = make_connection()
+    await _async_notify_update_callback(
+        hass, entry, MODE_KEY, make_entry(MODE_KEY[0], MODE_VID_OBJ, 1, edit=True), True
+    )
+    await hass.async_block_till_done()
+
+    state = hass.states.get(MODE_ENTITY_ID)
+    assert state.state == "Day"
+    assert "stale" not in state.attributes
@@ -0,0 +1,90 @@
+"""Update coalescing tests for the Harreither Integration."""
+
+from datetime import timedelta
+
+from homeassistant.const import STATE_UNAVAILABLE
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.harreither import (
+    _async_notify_update_callback,
+    async_flush_pending_entities,
+    async_mark_all_entries_unavailable,
+)
+from custom_components.harreither.const import CONF_COALESCE_TEMPERATURE
+
+from tests.common import MockConfigEntry, async_fire_time_changed
+from tests.conftest import (
+    TEMPERATURE_VID_OBJ,
+    async_setup_offline_entry,
+    make_connection,
+    make_entry,
+)
+
+KEY = (7, 2, None)
+WINDOW = 5
+
+
+async def _async_push(
+    hass: HomeAssistant, entry: MockConfigEntry, value: float, new: bool = False
+) -> None:
+    """Report a value of KEY to the entry."""
+    await _async_notify_update_callback(
+        hass, entry, KEY, make_entry(KEY[0], TEMPERATURE_VID_OBJ, value), new
+    )
+    await hass.async_block_till_done()
+
+
+async def _async_wait_window(hass: HomeAssistant) -> None:
+    """Let the coalescing window expire."""
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=WINDOW + 1))
+    await hass.async_block_till_done()
+
+
+async def _async_setup(hass: HomeAssistant) -> tuple[MockConfigEntry, str]:
+    """Set up an entry with a coalesced temperature sensor, return its entity id."""
+    entry = await async_setup_offline_entry(hass, {CONF_COALESCE_TEMPERATURE: WINDOW})
+    await _async_push(hass, entry, 20.0, new=True)
+    await async_flush_pending_entities(hass, entry)
+    await hass.async_block_till_done()
+    await _async_wait_window(hass)
+    entity_id = entry.runtime_data.entities[repr(KEY)].entity_id
+    assert float(hass.states.get(entity_id).state) == 20.0
+    return entry, entity_id
+
+
+async def test_latest_value_written_once_per_window(hass: HomeAssistant) -> None:
+    """Test only the last value reported within the window is written."""
+    entry, entity_id = await _async_setup(hass)
+    writes = []
+    hass.bus.async_listen("state_changed", writes.append)
+
+    for value in (20.5, 21.0, 21.5):
+        await _async_push(hass, entry, value)
+    assert float(hass.states.get(entity_id).state) == 20.0
+    assert entry.runtime_data.coalesce_pending == {
+        CONF_COALESCE_TEMPERATURE: {repr(KEY): 21.5}
+    }
+
+    await _async_wait_window(hass)
+    assert float(hass.states.get(entity_id).state) == 21.5
+    assert len(writes) == 1
+    assert entry.runtime_data.coalesce_unsubs == {}
+
+
+async def test_disconnect_drops_coalesced_values(hass: HomeAssistant) -> None:
+    """Test a window expiring after a disconnect does not block the next write."""
+    entry, entity_id = await _async_setup(hass)
+    await _async_push(hass, entry, 21.0)
+
+    async_mark_all_entries_unavailable(entry)
+    await hass.async_block_till_done()
+    assert entry.runtime_data.coalesce_pending == {}
+    await _async_wait_window(hass)
+    assert hass.states.get(entity_id).state == STATE_UNAVAILABLE
+
+    # The new connection reports the value the dropped window held
+    entry.runtime_data.connection = make_connection()
+    await _async_push(hass, entry, 21.0, new=True)
+    await _async_wait_window(hass)
+    assert float(hass.states.get(entity_id).state) == 21.0
@@ -0,0 +1,249 @@
+"""Connection and credential validation tests for the Harreither Integration."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from homeassistant import config_entries
+from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+
+from custom_components.harreither.brain import Entry
+from custom_components.harreither.connection import HarreitherConnection
+from custom_components.harreither.const import (
+    CONF_AREA,
+    DOMAIN,
+    WRITE_PIPELINE_WINDOW,
+)
+from custom_components.harreither.handoff import async_take_parked_connection
+from custom_components.harreither.scheduler import (
+    PRIORITY_AUTOMATION,
+    PRIORITY_INTERACTIVE,
+)
+
+from tests.common import MockConfigEntry
+from tests.conftest import FakeBrainSocket
+
+TEST_HOST = "192.168.1.100"
+TEST_USERNAME = "test_user"
+
+
+async def _async_submit_user_flow(hass: HomeAssistant, password: str) -> dict:
+    """Run the user step with the test credentials and password."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    return await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {
+            CONF_HOST: TEST_HOST,
+            CONF_USERNAME: TEST_USERNAME,
+            CONF_PASSWORD: password,
+            CONF_AREA: "boiler_room",
+        },
+    )
+
+
+async def test_connection_construction() -> None:
+    """Test a connection can be built before it connects."""
+    conn_obj = HarreitherConnection(traverse_screens_on_init=True)
+
+    assert conn_obj.ws is None
+    assert conn_obj.authenticated is None
+    assert len(conn_obj.flight_recorder) == 0
+
+
+async def test_user_flow_against_controller(
+    hass: HomeAssistant,
+    mock_setup_entry: AsyncMock,
+    mock_brain: FakeBrainSocket,
+) -> None:
+    """Test the user flow logs in and parks the validated connection."""
+    result = await _async_submit_user_flow(hass, "test_password")
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["title"] == TEST_USERNAME
+    assert [message["type_int"] for message in mock_brain.received] == [
+        11,
+        14,
+        16,
+        30,
+    ]
+
+    conn_obj = async_take_parked_connection(hass, f"ws://{TEST_HOST}", TEST_USERNAME)
+    assert conn_obj is not None
+    assert conn_obj.device_id == "brain-1"
+    assert conn_obj.stats.phases.keys() >= {"connect", "secure_handshake"}
+    await conn_obj.async_close()
+
+
+async def test_user_flow_denied_by_controller(
+    hass: HomeAssistant,
+    mock_brain: FakeBrainSocket,
+) -> None:
+    """Test a denied login shows an error and closes the socket."""
+    result = await _async_submit_user_flow(hass, "wrong_password")
+
+    assert result["type"] is FlowResultType.FORM
+    assert result["errors"] == {"base": "auth"}
+    assert mock_brain.closed
+    assert (
+        async_take_parked_connection(hass, f"ws://{TEST_HOST}", TEST_USERNAME) is None
+    )
+
+
+async def test_user_flow_abort_closes_validated_connection(
+    hass: HomeAssistant,
+    mock_brain: FakeBrainSocket,
+) -> None:
+    """Test a flow aborting after the login closes its connection, parking none."""
+    MockConfigEntry(domain=DOMAIN, unique_id=TEST_HOST).add_to_hass(hass)
+
+    result = await _async_submit_user_flow(hass, "test_password")
+    await hass.async_block_till_done()
+
+    assert result["type"] is FlowResultType.ABORT
+    assert result["reason"] == "already_configured"
+    assert mock_brain.closed
+    assert (
+        async_take_parked_connection(hass, f"ws://{TEST_HOST}", TEST_USERNAME) is None
+    )
+
+
+async def test_watchdog_ignores_traffic_before_the_session() -> None:
+    """Test a handed-off connection is not dropped for silence before its session."""
+    conn_obj = HarreitherConnection(traverse_screens_on_init=True)
+    conn_obj.ws = MagicMock()
+    conn_obj.watchdog_timeout = 0.05
+    # The config flow logged in long before the entry started
+    conn_obj.last_received = asyncio.get_running_loop().time() - 60
+
+    task = asyncio.create_task(conn_obj._async_watchdog())
+    await asyncio.sleep(0.01)
+    conn_obj.ws.transport.abort.assert_not_called()
+
+    await asyncio.wait_for(task, 1)
+    conn_obj.ws.transport.abort.assert_called_once()
+
+
+async def test_collapsed_updates_counted_per_key() -> None:
+    """Test updates collapsed by the update queue still count as received."""
+    conn_obj = HarreitherConnection()
+    key = (5, 2, None)
+    for value in (1, 2, 3):
+        await conn_obj.async_notify_update(key, Entry({"value": value}), False)
+
+    assert len(conn_obj.updates) == 1
+    assert conn_obj.key_stats[key].received == 3
+    assert conn_obj.key_stats[key].last_value == 3
+
+
+def _make_editable_entry(vid: int, screen_key: tuple) -> Entry:
+    """Return an editable entry on screen_key."""
+    return Entry(
+        {"VID": vid, "detail": 2, "edit": True, "value": 0, "_screen_key": screen_key}
+    )
+
+
+async def test_writes_pipelined_and_matched_to_acks(
+    mock_brain: FakeBrainSocket,
+) -> None:
+    """Test writes on a screen are sent without waiting for each ACK."""
+    conn_obj = HarreitherConnection()
+    await conn_obj.async_websocket_connect(f"ws://{TEST_HOST}")
+    await conn_obj.establish_secure_connection()
+    assert await conn_obj.authentication_obj.execute_authentication_now(
+        TEST_USERNAME, "test_password"
+    )
+    process = asyncio.create_task(conn_obj.messages_process())
+
+    # ACKs only come once every write of the window was sent, in reverse order
+    mock_brain.ack_batch = WRITE_PIPELINE_WINDOW
+    mock_brain.nack_vids = {2}
+    writes = [
+        (_make_editable_entry(vid, (100, None)), 1)
+        for vid in range(WRITE_PIPELINE_WINDOW)
+    ]
+    results = await asyncio.wait_for(conn_obj.async_write_values(writes), 5)
+
+    assert results == [vid != 2 for vid in range(WRITE_PIPELINE_WINDOW)]
+    sent_types = [message["type_int"] for message in mock_brain.received[4:]]
+    assert sent_types == [200] + [202] * WRITE_PIPELINE_WINDOW
+    assert conn_obj.stats.ack_rtt.count == WRITE_PIPELINE_WINDOW + 1
+
+    await conn_obj.async_close()
+    with pytest.raises(ConnectionError):
+        await process
+
+
+async def test_newer_write_supersedes_write_of_other_class(
+    mock_brain: FakeBrainSocket,
+) -> None:
+    """Test a user write replaces a queued automation write to the same key."""
+    conn_obj = HarreitherConnection()
+    await conn_obj.async_websocket_connect(f"ws://{TEST_HOST}")
+    await conn_obj.establish_secure_connection()
+    assert await conn_obj.authentication_obj.execute_authentication_now(
+        TEST_USERNAME, "test_password"
+    )
+    process = asyncio.create_task(conn_obj.messages_process())
+
+    data_entry = _make_editable_entry(5, (100, None))
+    automation = asyncio.ensure_future(
+        conn_obj.async_write_values([(data_entry, 1)], PRIORITY_AUTOMATION)
+    )
+    interactive = asyncio.ensure_future(
+        conn_obj.async_write_value(data_entry, 2, PRIORITY_INTERACTIVE)
+    )
+    results = await asyncio.wait_for(asyncio.gather(automation, interactive), 5)
+
+    assert results == [[True], True]
+    edited = [
+        message["payload"]["value"]
+        for message in mock_brain.received
+        if message["type_int"] == 202
+    ]
+    assert edited == [2]
+    assert conn_obj.scheduler.superseded == 1
+
+    await conn_obj.async_close()
+    with pytest.raises(ConnectionError):
+        await process
+
+
+async def test_rejected_write_retried_after_navigation(
+    mock_brain: FakeBrainSocket,
+) -> None:
+    """Test a NACK on a screen left by the controller navigates and retries."""
+    conn_obj = HarreitherConnection()
+    await conn_obj.async_websocket_connect(f"ws://{TEST_HOST}")
+    await conn_obj.establish_secure_connection()
+    assert await conn_obj.authentication_obj.execute_authentication_now(
+        TEST_USERNAME, "test_password"
+    )
+    process = asyncio.create_task(conn_obj.messages_process())
+
+    # The screen was active, but the controller switched to another one since
+    conn_obj.active_screen = (100, None)
+    mock_brain.screen = (300, None)
+    mock_brain.edit_screen = (100, None)
+    data_entry = _make_editable_entry(5, (100, None))
+
+    assert await asyncio.wait_for(conn_obj.async_write_value(data_entry, 1), 5)
+    sent_types = [message["type_int"] for message in mock_brain.received[4:]]
+    assert sent_types == [202, 200, 202]
+    assert conn_obj.active_screen == (100, None)
+
+    # A write the controller keeps rejecting is retried only once
+    mock_brain.nack_vids = {5}
+    sent = len(mock_brain.received)
+    assert not await asyncio.wait_for(conn_obj.async_write_value(data_entry, 2), 5)
+    sent_types = [message["type_int"] for message in mock_brain.received[sent:]]
+    assert sent_types == [202, 200, 202]
+    assert conn_obj.active_screen is None
+
+    await conn_obj.async_close()
+    with pytest.raises(ConnectionError):
+        await process
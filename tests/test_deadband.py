@@ -0,0 +1,126 @@
+"""Deadband tests for the Harreither Integration."""
+
+from datetime import timedelta
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.harreither import (
+    _async_notify_update_callback,
+    async_flush_pending_entities,
+)
+from custom_components.harreither.const import (
+    CONF_DEADBAND,
+    CONF_DEADBAND_MAX_AGE,
+)
+from custom_components.harreither.deadband import Deadband
+
+from tests.common import MockConfigEntry, async_fire_time_changed
+from tests.conftest import (
+    TEMPERATURE_VID_OBJ,
+    async_setup_offline_entry,
+    make_entry,
+)
+
+KEY = (7, 2, None)
+MAX_AGE = 60
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (None, None),
+        ("", None),
+        ("0", None),
+        (0.2, Deadband(0.2)),
+        (" 0.5 ", Deadband(0.5)),
+        ("1%", Deadband(1.0, relative=True)),
+    ],
+)
+def test_parse(value, expected) -> None:
+    """Test option values parse into deadbands, zero and empty disable it."""
+    assert Deadband.parse(value) == expected
+
+
+@pytest.mark.parametrize("value", ["abc", "-0.5", "%", "1%%"])
+def test_parse_invalid(value) -> None:
+    """Test invalid option values raise ValueError."""
+    with pytest.raises(ValueError):
+        Deadband.parse(value)
+
+
+def test_holds_absolute() -> None:
+    """Test an absolute deadband holds changes smaller than its amount."""
+    deadband = Deadband(0.5)
+    assert deadband.holds(20.0, 20.4)
+    assert deadband.holds(20.0, 19.6)
+    assert not deadband.holds(20.0, 20.5)
+    assert not deadband.holds(20.0, 19.0)
+
+
+def test_holds_relative() -> None:
+    """Test a relative deadband scales with the last written value."""
+    deadband = Deadband(10, relative=True)
+    assert deadband.holds(50.0, 54.0)
+    assert not deadband.holds(50.0, 55.0)
+    assert deadband.holds(-50.0, -46.0)
+    # Any change from zero is written
+    assert not deadband.holds(0.0, 0.1)
+
+
+async def _async_push(
+    hass: HomeAssistant, entry: MockConfigEntry, value: float, new: bool = False
+) -> None:
+    """Report a value of KEY to the entry."""
+    await _async_notify_update_callback(
+        hass, entry, KEY, make_entry(KEY[0], TEMPERATURE_VID_OBJ, value), new
+    )
+    await hass.async_block_till_done()
+
+
+async def test_held_value_bouncing_back_is_dropped(hass: HomeAssistant) -> None:
+    """Test a held value is not written once the value returns to the last write."""
+    entry = await async_setup_offline_entry(
+        hass, {CONF_DEADBAND: "0.5", CONF_DEADBAND_MAX_AGE: MAX_AGE}
+    )
+    await _async_push(hass, entry, 20.0, new=True)
+    await async_flush_pending_entities(hass, entry)
+    await hass.async_block_till_done()
+    # Written once the entity is added, this is the value the deadband compares to
+    await _async_push(hass, entry, 20.0)
+    entity_id = entry.runtime_data.entities[repr(KEY)].entity_id
+    assert float(hass.states.get(entity_id).state) == 20.0
+
+    await _async_push(hass, entry, 20.1)
+    assert entry.runtime_data.deadband_held == {repr(KEY): 20.1}
+
+    await _async_push(hass, entry, 20.0)
+    assert entry.runtime_data.deadband_held == {}
+    assert entry.runtime_data.deadband_unsubs == {}
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=MAX_AGE + 1))
+    await hass.async_block_till_done()
+    assert float(hass.states.get(entity_id).state) == 20.0
+
+
+async def test_held_value_written_after_max_age(hass: HomeAssistant) -> None:
+    """Test a held value is written once it is older than the maximum age."""
+    entry = await async_setup_offline_entry(
+        hass, {CONF_DEADBAND: "0.5", CONF_DEADBAND_MAX_AGE: MAX_AGE}
+    )
+    await _async_push(hass, entry, 20.0, new=True)
+    await async_flush_pending_entities(hass, entry)
+    await hass.async_block_till_done()
+    # Written once the entity is added, this is the value the deadband compares to
+    await _async_push(hass, entry, 20.0)
+    entity_id = entry.runtime_data.entities[repr(KEY)].entity_id
+
+    await _async_push(hass, entry, 20.2)
+    await _async_push(hass, entry, 20.3)
+    assert float(hass.states.get(entity_id).state) == 20.0
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=MAX_AGE + 1))
+    await hass.async_block_till_done()
+    assert float(hass.states.get(entity_id).state) == 20.3
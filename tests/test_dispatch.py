@@ -0,0 +1,62 @@
+"""Update dispatch tests for the Harreither Integration."""
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.harreither import (
+    _async_dispatch_ignore,
+    _async_notify_update_callback,
+    async_flush_pending_entities,
+)
+from custom_components.harreither.stats import KeyStats
+
+from tests.conftest import MODE_VID_OBJ, async_setup_offline_entry, make_entry
+
+
+async def test_unmatched_key_counted_once(hass: HomeAssistant) -> None:
+    """Test a key no rule matches is classified once and then ignored."""
+    entry = await async_setup_offline_entry(hass)
+    key = (9, 2, None)
+    vid_obj = {"type": 99, "text": "Unknown"}
+
+    for _ in range(3):
+        await _async_notify_update_callback(
+            hass, entry, key, make_entry(9, vid_obj), True
+        )
+
+    assert entry.runtime_data.unmatched_signatures.total() == 1
+    assert entry.runtime_data.dispatch[key] is _async_dispatch_ignore
+    assert repr(key) not in entry.runtime_data.entities
+
+
+async def test_write_counted_only_once_state_is_written(hass: HomeAssistant) -> None:
+    """Test values are cached as written only after the entity wrote its state."""
+    entry = await async_setup_offline_entry(hass)
+    runtime_data = entry.runtime_data
+    key = (5, 2, None)
+    vid_obj = MODE_VID_OBJ
+    # The connection counts the key when receiving it
+    runtime_data.key_stats[key] = KeyStats(0)
+
+    # The entity is created but not added to Home Assistant yet
+    await _async_notify_update_callback(
+        hass, entry, key, make_entry(5, vid_obj, 1), True
+    )
+    assert repr(key) not in runtime_data.last_values
+    assert runtime_data.key_stats[key].written == 0
+
+    await async_flush_pending_entities(hass, entry)
+    await hass.async_block_till_done()
+    await _async_notify_update_callback(
+        hass, entry, key, make_entry(5, vid_obj, 1), False
+    )
+    assert runtime_data.last_values[repr(key)] == 1
+    assert runtime_data.key_stats[key].written == 1
+
+    # An index outside the options is rejected by the enum sensor
+    await _async_notify_update_callback(
+        hass, entry, key, make_entry(5, vid_obj, 7), False
+    )
+    assert runtime_data.last_values[repr(key)] == 1
+    assert runtime_data.key_stats[key].written == 1
+    entity_id = runtime_data.entities[repr(key)].entity_id
+    assert hass.states.get(entity_id).state == "Day"
@@ -0,0 +1,89 @@
+"""Excluded screen tests for the Harreither Integration."""
+
+from unittest.mock import AsyncMock, patch
+
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+
+from custom_components.harreither import (
+    _async_dispatch_ignore,
+    _async_notify_update_callback,
+)
+from custom_components.harreither.brain import MC_AUTO, MessageSend, TypeInt
+from custom_components.harreither.connection import HarreitherConnection
+from custom_components.harreither.const import CONF_EXCLUDED_SCREENS, CONF_SCREENS
+
+from tests.conftest import (
+    MODE_VID_OBJ,
+    SCREEN_KEY,
+    async_setup_offline_entry,
+    make_entry,
+)
+
+EXCLUDED_SCREEN_KEY = (200, None)
+
+
+async def test_options_flow_stores_excluded_screens(hass: HomeAssistant) -> None:
+    """Test the screens step stores the screens that were not selected."""
+    entry = await async_setup_offline_entry(hass)
+    entry.runtime_data.connection.entries.screens[EXCLUDED_SCREEN_KEY] = {
+        "title": "Hot water"
+    }
+
+    with patch("custom_components.harreither._connection_loop", new_callable=AsyncMock):
+        result = await hass.config_entries.options.async_init(entry.entry_id)
+        result = await hass.config_entries.options.async_configure(
+            result["flow_id"], {}
+        )
+        assert result["step_id"] == "deadband"
+        result = await hass.config_entries.options.async_configure(
+            result["flow_id"], {}
+        )
+        assert result["step_id"] == "screens"
+        result = await hass.config_entries.options.async_configure(
+            result["flow_id"], {CONF_SCREENS: ["100"]}
+        )
+        await hass.async_block_till_done()
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert entry.options[CONF_EXCLUDED_SCREENS] == [[200, None]]
+    assert entry.runtime_data.excluded_screens == {EXCLUDED_SCREEN_KEY}
+
+
+async def test_entries_on_excluded_screens_get_no_entity(hass: HomeAssistant) -> None:
+    """Test keys on an excluded screen are ignored while others get entities."""
+    entry = await async_setup_offline_entry(
+        hass, {CONF_EXCLUDED_SCREENS: [list(EXCLUDED_SCREEN_KEY)]}
+    )
+    excluded_key = (6, 2, None)
+    included_key = (5, 2, None)
+
+    await _async_notify_update_callback(
+        hass,
+        entry,
+        excluded_key,
+        make_entry(6, MODE_VID_OBJ, screen_key=EXCLUDED_SCREEN_KEY),
+        True,
+    )
+    await _async_notify_update_callback(
+        hass, entry, included_key, make_entry(5, MODE_VID_OBJ), True
+    )
+
+    runtime_data = entry.runtime_data
+    assert list(runtime_data.entities) == [repr(included_key)]
+    assert runtime_data.dispatch[excluded_key] is _async_dispatch_ignore
+
+
+async def test_traversal_skips_excluded_screens() -> None:
+    """Test navigation to an excluded screen is answered without being sent."""
+    conn_obj = HarreitherConnection()
+    conn_obj.excluded_screens = {EXCLUDED_SCREEN_KEY}
+    conn_obj.scheduler.async_submit = AsyncMock(return_value=True)
+
+    for screen_id, expected in ((EXCLUDED_SCREEN_KEY[0], False), (SCREEN_KEY[0], True)):
+        msg = MessageSend(
+            type_int=TypeInt.ACTUAL_SCREEN, mc=MC_AUTO, payload={"screenID": screen_id}
+        )
+        assert await conn_obj.enqueue_message_get_ack(msg) is expected
+
+    conn_obj.scheduler.async_submit.assert_awaited_once()
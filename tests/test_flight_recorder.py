@@ -0,0 +1,55 @@
+"""Flight recorder tests for the Harreither Integration."""
+
+from unittest.mock import patch
+
+from custom_components.harreither.brain import MessageSend
+from custom_components.harreither.flight_recorder import FlightRecorder, LogRateLimiter
+
+
+def _redact(payload):
+    """Return payloads unchanged."""
+    return payload
+
+
+def test_recorded_payload_summarized_when_dumped() -> None:
+    """Test payloads are kept uncopied and summarized without client descriptors."""
+    recorder = FlightRecorder()
+    item = {"VID": 7, "detail": 2, "value": 21.5, "elements": [{"text": "Off"}]}
+    msg = MessageSend(type_int=300, mc=20001, payload={"items": [item]})
+
+    recorder.record_message("in", msg)
+    item["_vid_obj"] = {"type": 12}
+    item["_screen_key"] = (100, None)
+
+    [event] = recorder.dump(_redact)
+    assert event["kind"] == "in"
+    assert event["details"] == [
+        300,
+        20001,
+        None,
+        {"items": [{"VID": 7, "detail": 2, "value": 21.5, "elements": "<1 items>"}]},
+    ]
+    # The dump does not change the recorded payload
+    assert item["elements"] == [{"text": "Off"}]
+
+
+def test_recorder_keeps_the_latest_events() -> None:
+    """Test the recorder drops the oldest events once full."""
+    recorder = FlightRecorder(size=3)
+    for value in range(5):
+        recorder.record("written", "(1, 2, None)", value)
+
+    assert len(recorder) == 3
+    assert [event["details"][1] for event in recorder.dump(_redact)] == [2, 3, 4]
+
+
+def test_log_rate_limiter_counts_dropped_lines() -> None:
+    """Test lines beyond the rate are dropped and counted, per second."""
+    limiter = LogRateLimiter(2)
+    with patch("custom_components.harreither.flight_recorder.time") as mock_time:
+        mock_time.monotonic.return_value = 100.2
+        assert [limiter.allow() for _ in range(4)] == [True, True, False, False]
+        mock_time.monotonic.return_value = 101.0
+        assert limiter.allow()
+
+    assert limiter.dropped == 2
@@ -0,0 +1,24 @@
+"""Setup and unload tests for the Harreither Integration."""
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant
+
+from custom_components.harreither.const import DOMAIN
+from custom_components.harreither.services import SERVICE_SET_VALUES
+
+from tests.conftest import async_setup_offline_entry
+
+
+async def test_setup_and_unload_entry(hass: HomeAssistant) -> None:
+    """Test an entry starts its connection task and stops it again on unload."""
+    entry = await async_setup_offline_entry(hass)
+    assert entry.state is ConfigEntryState.LOADED
+    assert hass.services.has_service(DOMAIN, SERVICE_SET_VALUES)
+    runtime_data = entry.runtime_data
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert entry.state is ConfigEntryState.NOT_LOADED
+    assert runtime_data.connection_task.done()
+    assert runtime_data.flush_unsub is None
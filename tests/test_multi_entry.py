@@ -0,0 +1,140 @@
+"""Multi-controller tests for the Harreither Integration."""
+
+from collections import Counter
+from dataclasses import fields
+from itertools import combinations
+from unittest.mock import AsyncMock, patch
+
+from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.entity_platform import EntityPlatform
+
+from custom_components.harreither import (
+    _async_notify_update_callback,
+    async_flush_pending_entities,
+)
+from custom_components.harreither.const import DOMAIN
+from custom_components.harreither.data import HarreitherData
+
+from tests.common import MockConfigEntry
+from tests.conftest import TEMPERATURE_VID_OBJ, make_connection, make_entry
+
+KEYS_PER_CONTROLLER = 200
+
+
+async def _async_setup_controllers(
+    hass: HomeAssistant, count: int
+) -> list[MockConfigEntry]:
+    """Set up count config entries without connecting to a controller."""
+    entries = []
+    with patch("custom_components.harreither._connection_loop", new_callable=AsyncMock):
+        for index in range(count):
+            entry = MockConfigEntry(
+                domain=DOMAIN,
+                data={
+                    CONF_HOST: f"192.168.1.{100 + index}",
+                    CONF_USERNAME: "test_user",
+                    CONF_PASSWORD: "test_password",
+                },
+                unique_id=f"192.168.1.{100 + index}",
+                title=f"building_{index}",
+            )
+            entry.add_to_hass(hass)
+            assert await hass.config_entries.async_setup(entry.entry_id)
+            entry.runtime_data.connection = make_connection()
+            entries.append(entry)
+    await hass.async_block_till_done()
+    return entries
+
+
+async def _async_report_keys(hass: HomeAssistant, entries: list) -> None:
+    """Report KEYS_PER_CONTROLLER new keys to every entry."""
+    for entry in entries:
+        for vid in range(KEYS_PER_CONTROLLER):
+            await _async_notify_update_callback(
+                hass,
+                entry,
+                (vid, 2, None),
+                make_entry(vid, TEMPERATURE_VID_OBJ, 21.5),
+                True,
+            )
+        await async_flush_pending_entities(hass, entry)
+    await hass.async_block_till_done()
+
+
+async def test_entities_stay_with_their_controller(hass: HomeAssistant) -> None:
+    """Test that each controller adds its entities through its own platforms."""
+    entries = await _async_setup_controllers(hass, 3)
+    await _async_report_keys(hass, entries)
+
+    registry = er.async_get(hass)
+    for entry in entries:
+        registry_entries = [
+            registry_entry
+            for registry_entry in er.async_entries_for_config_entry(
+                registry, entry.entry_id
+            )
+            if "-health-" not in registry_entry.unique_id
+        ]
+        assert len(registry_entries) == KEYS_PER_CONTROLLER
+        assert all(
+            registry_entry.unique_id.startswith(entry.entry_id)
+            for registry_entry in registry_entries
+        )
+        for entity in entry.runtime_data.entities.values():
+            assert entity.platform.config_entry is entry
+
+
+async def test_controllers_do_independent_work(hass: HomeAssistant) -> None:
+    """Test that each controller adds its entities in one batch and shares no state."""
+    entries = await _async_setup_controllers(hass, 4)
+    with patch.object(
+        EntityPlatform,
+        "async_add_entities",
+        autospec=True,
+        side_effect=EntityPlatform.async_add_entities,
+    ) as mock_add_entities:
+        await _async_report_keys(hass, entries)
+
+    added = Counter()
+    for call in mock_add_entities.call_args_list:
+        platform, entities = call.args[:2]
+        added[platform.config_entry.entry_id] += 1
+        assert len(entities) == KEYS_PER_CONTROLLER
+    assert added == {entry.entry_id: 1 for entry in entries}
+
+    # The integration object is the only thing entries may have in common
+    for first, second in combinations(entries, 2):
+        for data_field in fields(HarreitherData):
+            value = getattr(first.runtime_data, data_field.name)
+            if data_field.name == "integration" or isinstance(
+                value, (int, float, str, type(None))
+            ):
+                continue
+            assert value is not getattr(second.runtime_data, data_field.name)
+
+
+async def test_health_sensors_per_controller_device(hass: HomeAssistant) -> None:
+    """Test that each controller's health sensors belong to its own device."""
+    entries = await _async_setup_controllers(hass, 2)
+
+    registry = er.async_get(hass)
+    device_ids = set()
+    for entry in entries:
+        health_entries = [
+            registry_entry
+            for registry_entry in er.async_entries_for_config_entry(
+                registry, entry.entry_id
+            )
+            if "-health-" in registry_entry.unique_id
+        ]
+        assert health_entries
+        assert len({registry_entry.device_id for registry_entry in health_entries}) == 1
+        device_ids.add(health_entries[0].device_id)
+        assert all(
+            not registry_entry.entity_id.endswith("_2")
+            for registry_entry in health_entries
+        )
+
+    assert len(device_ids) == 2
@@ -0,0 +1,143 @@
+"""Reconnect reconciliation tests for the Harreither Integration."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from homeassistant.const import STATE_UNAVAILABLE
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry
+
+from custom_components.harreither import (
+    _async_notify_update_callback,
+    _async_sync_session,
+    async_flush_pending_entities,
+    async_mark_all_entries_unavailable,
+    async_remove_stale_entries,
+)
+
+from tests.common import MockConfigEntry
+from tests.conftest import (
+    MODE_VID_OBJ,
+    async_setup_offline_entry,
+    make_connection,
+    make_entry,
+)
+
+KEPT_KEY = (5, 2, None)
+STALE_KEY = (6, 2, None)
+
+
+async def _async_reconnect(hass: HomeAssistant, entry: MockConfigEntry) -> None:
+    """Drop the connection and hand the entry a new traversing connection."""
+    async_mark_all_entries_unavailable(entry)
+    await hass.async_block_till_done()
+    entry.runtime_data.connection = make_connection()
+
+
+async def _async_setup(hass: HomeAssistant) -> tuple[MockConfigEntry, str, str]:
+    """Set up an entry with two entities, return it and their entity ids."""
+    entry = await async_setup_offline_entry(hass)
+    for key in (KEPT_KEY, STALE_KEY):
+        await _async_notify_update_callback(
+            hass, entry, key, make_entry(key[0], MODE_VID_OBJ, 1), True
+        )
+    await async_flush_pending_entities(hass, entry)
+    await hass.async_block_till_done()
+    entities = entry.runtime_data.entities
+    return (
+        entry,
+        entities[repr(KEPT_KEY)].entity_id,
+        entities[repr(STALE_KEY)].entity_id,
+    )
+
+
+async def test_reconnect_rebinds_reported_entities(hass: HomeAssistant) -> None:
+    """Test entities go unavailable on disconnect and keep their id on rebind."""
+    entry, kept_id, _ = await _async_setup(hass)
+    kept_entity = entry.runtime_data.entities[repr(KEPT_KEY)]
+
+    await _async_reconnect(hass, entry)
+    assert hass.states.get(kept_id).state == STATE_UNAVAILABLE
+    assert not entry.runtime_data.session_keys
+
+    new_entry = make_entry(KEPT_KEY[0], MODE_VID_OBJ, 2)
+    await _async_notify_update_callback(hass, entry, KEPT_KEY, new_entry, True)
+    await hass.async_block_till_done()
+
+    assert entry.runtime_data.entities[repr(KEPT_KEY)] is kept_entity
+    assert kept_entity._data_entry is new_entry
+    assert entry.runtime_data.session_keys == {repr(KEPT_KEY)}
+    assert hass.states.get(kept_id).state == "Night"
+
+
+async def test_stale_entities_removed_after_reconnect(hass: HomeAssistant) -> None:
+    """Test only entities the new connection did not report are removed."""
+    entry, kept_id, stale_id = await _async_setup(hass)
+    registry = entity_registry.async_get(hass)
+
+    await _async_reconnect(hass, entry)
+    await _async_notify_update_callback(
+        hass, entry, KEPT_KEY, make_entry(KEPT_KEY[0], MODE_VID_OBJ, 1), True
+    )
+    await async_remove_stale_entries(hass, entry)
+    await hass.async_block_till_done()
+
+    runtime_data = entry.runtime_data
+    assert list(runtime_data.entities) == [repr(KEPT_KEY)]
+    assert KEPT_KEY in runtime_data.dispatch
+    assert STALE_KEY not in runtime_data.dispatch
+    assert kept_id in registry.entities
+    assert stale_id not in registry.entities
+    assert hass.states.get(stale_id) is None
+
+
+async def test_no_stale_entities_when_all_reported(hass: HomeAssistant) -> None:
+    """Test a reconnect reporting every key removes nothing."""
+    entry, kept_id, other_id = await _async_setup(hass)
+    registry = entity_registry.async_get(hass)
+
+    await _async_reconnect(hass, entry)
+    for key in (KEPT_KEY, STALE_KEY):
+        await _async_notify_update_callback(
+            hass, entry, key, make_entry(key[0], MODE_VID_OBJ, 1), True
+        )
+    await async_remove_stale_entries(hass, entry)
+
+    assert len(entry.runtime_data.entities) == 2
+    assert kept_id in registry.entities
+    assert other_id in registry.entities
+
+
+@pytest.mark.parametrize("traversal_completed", [True, False])
+async def test_sync_session_reconciles_only_after_traversal(
+    hass: HomeAssistant, traversal_completed: bool
+) -> None:
+    """Test a failed traversal neither removes entities nor saves the catalog."""
+    entry, kept_id, stale_id = await _async_setup(hass)
+    registry = entity_registry.async_get(hass)
+
+    await _async_reconnect(hass, entry)
+    conn_obj = entry.runtime_data.connection
+    conn_obj.event_initial_setup_complete.wait = AsyncMock()
+    conn_obj.event_initial_traverse_screens_complete.wait = AsyncMock()
+    conn_obj.updates.async_wait_idle = AsyncMock()
+    conn_obj.session_started = None
+    conn_obj.device_id = "brain-1"
+    conn_obj.traversal_completed = traversal_completed
+    await _async_notify_update_callback(
+        hass, entry, KEPT_KEY, make_entry(KEPT_KEY[0], MODE_VID_OBJ, 1), True
+    )
+
+    with (
+        patch("custom_components.harreither.async_assign_area_and_tags"),
+        patch.object(
+            entry.runtime_data.catalog_store, "async_save", new_callable=AsyncMock
+        ) as mock_save,
+    ):
+        await _async_sync_session(hass, entry, conn_obj)
+    await hass.async_block_till_done()
+
+    assert kept_id in registry.entities
+    assert (stale_id in registry.entities) is not traversal_completed
+    assert mock_save.await_count == int(traversal_completed)
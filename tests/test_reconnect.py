@@ -0,0 +1,101 @@
+"""Reconnection tests for the Harreither Integration."""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+import websockets.exceptions  # noqa: F401 - loaded by websockets.connect in production
+
+from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from custom_components.harreither import _connection_loop
+from custom_components.harreither.const import DOMAIN
+from custom_components.harreither.flight_recorder import FlightRecorder
+from custom_components.harreither.stats import ConnectionStats
+
+from tests.common import MockConfigEntry
+
+ATTEMPTS = 4
+
+
+class DroppingConnection:
+    """Connection whose controller accepts the login and then drops the socket."""
+
+    session_length = 0.0
+
+    def __init__(self, **kwargs) -> None:
+        """Initialize the connection."""
+        self.stats = ConnectionStats()
+        self.flight_recorder = FlightRecorder()
+        self.authenticated: bool | None = None
+        self.session_started: float | None = None
+
+    def add_async_notify_update_callback(self, callback) -> None:
+        """Ignore the update callback."""
+
+    async def async_websocket_connect(self, ws_url, proxy_url=None) -> None:
+        """Pretend to connect."""
+
+    async def establish_secure_connection(self) -> None:
+        """Pretend to run the handshake."""
+
+    async def async_authenticate(self, username: str, password: str) -> None:
+        """Accept the login."""
+        self.authenticated = True
+        self.session_started = time.monotonic()
+
+    async def messages_process(self) -> None:
+        """Drop the session after session_length seconds."""
+        self.session_started -= self.session_length
+        raise ConnectionError("Controller closed the socket")
+
+    async def async_close(self) -> None:
+        """Pretend to close."""
+
+
+async def _async_retry_counts(hass: HomeAssistant, session_length: float) -> list:
+    """Run the connection loop for ATTEMPTS sessions, return the retry counts."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_HOST: "192.168.1.100",
+            CONF_USERNAME: "test_user",
+            CONF_PASSWORD: "test_password",
+        },
+        unique_id="192.168.1.100",
+    )
+    entry.add_to_hass(hass)
+    with patch("custom_components.harreither._connection_loop", new_callable=AsyncMock):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+
+    retry_counts = []
+
+    def _record_delay(retry_count: int, max_delay: float) -> float:
+        if len(retry_counts) == ATTEMPTS:
+            raise asyncio.CancelledError
+        retry_counts.append(retry_count)
+        return 0
+
+    DroppingConnection.session_length = session_length
+    with (
+        patch("custom_components.harreither._reconnect_delay", _record_delay),
+        patch("custom_components.harreither.HarreitherConnection", DroppingConnection),
+        patch(
+            "custom_components.harreither._async_sync_session", new_callable=AsyncMock
+        ),
+        pytest.raises(asyncio.CancelledError),
+    ):
+        await _connection_loop(hass, entry)
+    return retry_counts
+
+
+async def test_short_sessions_keep_backing_off(hass: HomeAssistant) -> None:
+    """Test sessions dropped right after the login do not reset the backoff."""
+    assert await _async_retry_counts(hass, 0) == [0, 1, 2, 3]
+
+
+async def test_stable_session_resets_backoff(hass: HomeAssistant) -> None:
+    """Test a session that stayed up reconnects without delay."""
+    assert await _async_retry_counts(hass, 3600) == [0, 1, 1, 1]
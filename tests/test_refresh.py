@@ -0,0 +1,91 @@
+"""Screen refresh tests for the Harreither Integration."""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from custom_components.harreither.refresh import ScreenRefresher
+
+HOT_SCREEN = (100, None)
+COLD_SCREEN = (200, None)
+DISABLED_SCREEN = (300, None)
+INTERVAL = 10
+
+
+class _Clock:
+    """Monotonic clock that only advances while the refresher sleeps."""
+
+    def __init__(self) -> None:
+        """Start the clock."""
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        """Return the current time."""
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        """Advance the clock instead of waiting."""
+        self.now += seconds
+
+
+def _make_entry() -> SimpleNamespace:
+    """Return an entry with entities on a hot, a cold and a disabled screen."""
+    entities = {
+        repr(key): SimpleNamespace(_data_entry={"_screen_key": key}, enabled=enabled)
+        for key, enabled in (
+            (HOT_SCREEN, True),
+            (COLD_SCREEN, True),
+            (DISABLED_SCREEN, False),
+        )
+    }
+    return SimpleNamespace(
+        runtime_data=SimpleNamespace(
+            entities=entities, screen_activity={HOT_SCREEN: 995.0}
+        )
+    )
+
+
+async def _async_run_refresher(
+    clock: _Clock, refreshes: int, writes_until: float = 0
+) -> list[tuple[tuple, float]]:
+    """Run a refresher until it refreshed refreshes times, return the visits."""
+    visits = []
+
+    async def _async_refresh_screen(screen_key: tuple) -> bool:
+        visits.append((screen_key, clock.now))
+        if len(visits) == refreshes:
+            raise ConnectionError
+        return True
+
+    conn_obj = MagicMock()
+    conn_obj.scheduler.pending.side_effect = lambda _priority: (
+        1 if clock.now < writes_until else 0
+    )
+    conn_obj.async_refresh_screen = _async_refresh_screen
+    with (
+        patch("custom_components.harreither.refresh.time", clock),
+        patch("custom_components.harreither.refresh.asyncio", clock),
+    ):
+        await ScreenRefresher(_make_entry(), conn_obj, INTERVAL).async_run()
+    return visits
+
+
+async def test_recently_changed_screens_refreshed_more_often() -> None:
+    """Test hot screens are visited every interval and cold ones less often."""
+    visits = await _async_run_refresher(_Clock(), 6)
+
+    # The hot screen cools down once its last change is a cold interval old
+    assert visits == [
+        (HOT_SCREEN, 1010.0),
+        (HOT_SCREEN, 1020.0),
+        (HOT_SCREEN, 1030.0),
+        (COLD_SCREEN, 1040.0),
+        (HOT_SCREEN, 1070.0),
+        (COLD_SCREEN, 1080.0),
+    ]
+
+
+async def test_refresh_waits_for_queued_writes() -> None:
+    """Test refreshes pause while writes are queued."""
+    visits = await _async_run_refresher(_Clock(), 1, writes_until=1012.0)
+
+    assert visits == [(HOT_SCREEN, 1015.0)]
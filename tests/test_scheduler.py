@@ -0,0 +1,140 @@
+"""Command scheduler tests for the Harreither Integration."""
+
+import asyncio
+
+import pytest
+
+from custom_components.harreither.scheduler import (
+    PRIORITY_AUTOMATION,
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    CommandScheduler,
+    TokenBucket,
+)
+
+
+def _command(order: list, name: str):
+    """Return a command appending name to order and returning it."""
+
+    async def _run() -> str:
+        order.append(name)
+        return name
+
+    return _run
+
+
+async def test_commands_run_by_priority_then_submission() -> None:
+    """Test queued commands run highest priority first, in submission order."""
+    scheduler = CommandScheduler(rate=1000, burst=1000)
+    order: list[str] = []
+    submitted = [
+        (PRIORITY_BACKGROUND, "refresh"),
+        (PRIORITY_AUTOMATION, "scene 1"),
+        (PRIORITY_INTERACTIVE, "user"),
+        (PRIORITY_AUTOMATION, "scene 2"),
+    ]
+    futures = [
+        asyncio.ensure_future(scheduler.async_submit(priority, _command(order, name)))
+        for priority, name in submitted
+    ]
+    await asyncio.sleep(0)
+    assert scheduler.queue_depths() == {
+        "interactive": 1,
+        "automation": 2,
+        "background": 1,
+    }
+
+    runner = asyncio.create_task(scheduler.async_run())
+    results = await asyncio.gather(*futures)
+    runner.cancel()
+
+    assert order == ["user", "scene 1", "scene 2", "refresh"]
+    assert results == ["refresh", "scene 1", "user", "scene 2"]
+    assert scheduler.completed == 4
+
+
+async def test_dedupe_key_supersedes_queued_command() -> None:
+    """Test a newer command with the same key replaces the queued one."""
+    scheduler = CommandScheduler(rate=1000, burst=1000)
+    order: list[str] = []
+    first = asyncio.ensure_future(
+        scheduler.async_submit(
+            PRIORITY_BACKGROUND, _command(order, "old"), dedupe_key="screen"
+        )
+    )
+    second = asyncio.ensure_future(
+        scheduler.async_submit(
+            PRIORITY_AUTOMATION, _command(order, "new"), dedupe_key="screen"
+        )
+    )
+    await asyncio.sleep(0)
+    assert scheduler.pending(PRIORITY_BACKGROUND) == 0
+    assert scheduler.pending(PRIORITY_AUTOMATION) == 1
+
+    runner = asyncio.create_task(scheduler.async_run())
+    assert await asyncio.gather(first, second) == ["new", "new"]
+    runner.cancel()
+
+    assert order == ["new"]
+    assert scheduler.superseded == 1
+
+
+async def test_failed_command_only_fails_its_caller() -> None:
+    """Test an exception is handed to the caller and the scheduler keeps running."""
+    scheduler = CommandScheduler(rate=1000, burst=1000)
+    order: list[str] = []
+
+    async def _fail() -> None:
+        raise ValueError("NACK")
+
+    runner = asyncio.create_task(scheduler.async_run())
+    with pytest.raises(ValueError, match="NACK"):
+        await scheduler.async_submit(PRIORITY_INTERACTIVE, _fail)
+    assert (
+        await scheduler.async_submit(PRIORITY_INTERACTIVE, _command(order, "next"))
+        == "next"
+    )
+    runner.cancel()
+
+
+async def test_queued_commands_fail_when_stopped() -> None:
+    """Test queued commands fail with ConnectionError once the scheduler stops."""
+    scheduler = CommandScheduler(rate=1000, burst=1000)
+    started = asyncio.Event()
+
+    async def _block() -> None:
+        started.set()
+        await asyncio.Event().wait()
+
+    running = asyncio.ensure_future(scheduler.async_submit(PRIORITY_BACKGROUND, _block))
+    queued = asyncio.ensure_future(
+        scheduler.async_submit(PRIORITY_BACKGROUND, _command([], "queued"))
+    )
+    runner = asyncio.create_task(scheduler.async_run())
+    await started.wait()
+    runner.cancel()
+
+    for future in (running, queued):
+        with pytest.raises(ConnectionError):
+            await future
+    assert scheduler.queue_depths() == {
+        "interactive": 0,
+        "automation": 0,
+        "background": 0,
+    }
+
+
+async def test_token_bucket_limits_rate_after_burst() -> None:
+    """Test the bucket lets a burst through and then waits for tokens."""
+    bucket = TokenBucket(rate=100, burst=3)
+    loop = asyncio.get_running_loop()
+
+    start = loop.time()
+    for _ in range(3):
+        await bucket.async_acquire()
+    assert bucket.throttled == 0
+
+    for _ in range(2):
+        await bucket.async_acquire()
+    assert bucket.throttled >= 2
+    assert loop.time() - start >= 0.015
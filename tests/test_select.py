@@ -0,0 +1,83 @@
+"""Select tests for the Harreither Integration."""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from homeassistant.components.select import (
+    ATTR_OPTION,
+    DOMAIN as SELECT_DOMAIN,
+    SERVICE_SELECT_OPTION,
+)
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.harreither import (
+    _async_notify_update_callback,
+    async_flush_pending_entities,
+)
+
+from tests.common import MockConfigEntry
+from tests.conftest import MODE_VID_OBJ, async_setup_offline_entry, make_entry
+
+KEY = (5, 2, None)
+
+
+async def _async_push(hass: HomeAssistant, entry: MockConfigEntry, value: int) -> None:
+    """Report a value of KEY to the entry."""
+    await _async_notify_update_callback(
+        hass, entry, KEY, make_entry(KEY[0], MODE_VID_OBJ, value, edit=True), False
+    )
+    await hass.async_block_till_done()
+
+
+async def _async_setup(hass: HomeAssistant) -> tuple[MockConfigEntry, str]:
+    """Set up an entry with a mode select showing Off, return its entity id."""
+    entry = await async_setup_offline_entry(hass)
+    await _async_notify_update_callback(
+        hass, entry, KEY, make_entry(KEY[0], MODE_VID_OBJ, edit=True), True
+    )
+    await async_flush_pending_entities(hass, entry)
+    await hass.async_block_till_done()
+    await _async_push(hass, entry, 0)
+    entity_id = entry.runtime_data.entities[repr(KEY)].entity_id
+    assert hass.states.get(entity_id).state == "Off"
+    return entry, entity_id
+
+
+async def _async_select(hass: HomeAssistant, entity_id: str, option: str) -> None:
+    """Select an option through the select service."""
+    await hass.services.async_call(
+        SELECT_DOMAIN,
+        SERVICE_SELECT_OPTION,
+        {ATTR_ENTITY_ID: entity_id, ATTR_OPTION: option},
+        blocking=True,
+    )
+
+
+async def test_rejected_option_is_reverted(hass: HomeAssistant) -> None:
+    """Test a NACKed write restores the previous option and fails the call."""
+    entry, entity_id = await _async_setup(hass)
+    connection = entry.runtime_data.connection
+    connection.async_write_value = AsyncMock(return_value=False)
+
+    with pytest.raises(HomeAssistantError):
+        await _async_select(hass, entity_id, "Night")
+
+    connection.async_write_value.assert_awaited_once()
+    assert connection.async_write_value.await_args.args[1] == 2
+    assert hass.states.get(entity_id).state == "Off"
+
+
+async def test_push_after_select_is_written(hass: HomeAssistant) -> None:
+    """Test the controller's push after a write is not dropped as unchanged."""
+    entry, entity_id = await _async_setup(hass)
+    entry.runtime_data.connection.async_write_value = AsyncMock(return_value=True)
+
+    await _async_select(hass, entity_id, "Day")
+    assert hass.states.get(entity_id).state == "Day"
+
+    # The controller applied another change in between and reports the old index
+    await _async_push(hass, entry, 0)
+    assert hass.states.get(entity_id).state == "Off"
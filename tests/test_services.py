@@ -0,0 +1,119 @@
+"""Service tests for the Harreither Integration."""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+
+from custom_components.harreither import (
+    _async_notify_update_callback,
+    async_flush_pending_entities,
+)
+from custom_components.harreither.const import DOMAIN
+from custom_components.harreither.scheduler import PRIORITY_AUTOMATION
+from custom_components.harreither.services import SERVICE_SET_VALUES
+
+from tests.common import MockConfigEntry
+from tests.conftest import MODE_VID_OBJ, async_setup_offline_entry, make_entry
+
+MODE_KEY = (5, 2, None)
+RAW_KEY = (6, 2, None)
+
+
+async def _async_setup(hass: HomeAssistant) -> tuple[MockConfigEntry, str]:
+    """Set up an entry with an editable mode select, return it and its entity id."""
+    entry = await async_setup_offline_entry(hass)
+    mode_entry = make_entry(MODE_KEY[0], MODE_VID_OBJ, edit=True)
+    raw_entry = make_entry(RAW_KEY[0], MODE_VID_OBJ, edit=True)
+    await _async_notify_update_callback(hass, entry, MODE_KEY, mode_entry, True)
+    await async_flush_pending_entities(hass, entry)
+    await hass.async_block_till_done()
+
+    connection = entry.runtime_data.connection
+    connection.entries.get_entry.side_effect = {RAW_KEY: raw_entry}.get
+    connection.async_write_values = AsyncMock(return_value=[True, False])
+    return entry, entry.runtime_data.entities[repr(MODE_KEY)].entity_id
+
+
+async def test_set_values_returns_result_per_item(hass: HomeAssistant) -> None:
+    """Test one batch is written per controller and each item gets its result."""
+    entry, entity_id = await _async_setup(hass)
+    values = [
+        {ATTR_ENTITY_ID: entity_id, "value": "Night"},
+        {"key": list(RAW_KEY), "value": 1},
+    ]
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_SET_VALUES,
+        {"config_entry_id": entry.entry_id, "values": values},
+        blocking=True,
+        return_response=True,
+    )
+
+    connection = entry.runtime_data.connection
+    connection.async_write_values.assert_awaited_once()
+    writes = connection.async_write_values.await_args.args[0]
+    assert [(data_entry["VID"], value) for data_entry, value in writes] == [
+        (MODE_KEY[0], 2),
+        (RAW_KEY[0], 1),
+    ]
+    assert connection.async_write_values.await_args.kwargs == {
+        "priority": PRIORITY_AUTOMATION
+    }
+    assert response == {
+        "results": [
+            {**values[0], "success": True},
+            {**values[1], "success": False},
+        ]
+    }
+
+
+async def test_set_values_validates_all_items_first(hass: HomeAssistant) -> None:
+    """Test an invalid item fails the call before anything is written."""
+    entry, entity_id = await _async_setup(hass)
+    entry.runtime_data.connection.entries.get_entry.side_effect = {
+        RAW_KEY: make_entry(RAW_KEY[0], MODE_VID_OBJ, edit=False)
+    }.get
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SET_VALUES,
+            {
+                "config_entry_id": entry.entry_id,
+                "values": [
+                    {ATTR_ENTITY_ID: entity_id, "value": "Day"},
+                    {"key": list(RAW_KEY), "value": 1},
+                ],
+            },
+            blocking=True,
+            return_response=True,
+        )
+
+    entry.runtime_data.connection.async_write_values.assert_not_awaited()
+
+
+@pytest.mark.parametrize("value", [True, 3, "-1"])
+async def test_set_values_rejects_values_outside_options(
+    hass: HomeAssistant, value: bool | int | str
+) -> None:
+    """Test a select value must be one of its options or an index of them."""
+    entry, entity_id = await _async_setup(hass)
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SET_VALUES,
+            {
+                "config_entry_id": entry.entry_id,
+                "values": [{ATTR_ENTITY_ID: entity_id, "value": value}],
+            },
+            blocking=True,
+            return_response=True,
+        )
+
+    entry.runtime_data.connection.async_write_values.assert_not_awaited()
@@ -0,0 +1,91 @@
+"""Performance counter tests for the Harreither Integration."""
+
+from unittest.mock import patch
+
+from custom_components.harreither.stats import (
+    RATE_WINDOW,
+    ConnectionStats,
+    KeyStats,
+    LatencyHistogram,
+    RateCounter,
+    hot_keys,
+)
+
+
+def test_latency_histogram_percentiles() -> None:
+    """Test percentiles report the upper bound of their bucket."""
+    histogram = LatencyHistogram()
+    assert histogram.percentile(50) is None
+
+    for seconds in (0.0005, 0.003, 0.003, 0.04, 7.5):
+        histogram.record(seconds)
+
+    assert histogram.count == 5
+    assert histogram.percentile(50) == 5
+    assert histogram.percentile(80) == 50
+    # Beyond the last bucket the largest duration is reported
+    assert histogram.percentile(100) == 7500.0
+    assert histogram.as_dict()["buckets"][">5000ms"] == 1
+
+
+def test_rate_counter_window() -> None:
+    """Test the rate covers full seconds of the window and forgets older ones."""
+    with patch("custom_components.harreither.stats.time") as mock_time:
+        mock_time.monotonic.return_value = 1000.5
+        counter = RateCounter()
+        for _ in range(RATE_WINDOW - 1):
+            counter.record()
+        # Events of the current, incomplete second do not count yet
+        assert counter.rate() == 0
+
+        mock_time.monotonic.return_value = 1001.5
+        assert counter.rate() == 1
+
+        mock_time.monotonic.return_value = 1000.5 + RATE_WINDOW
+        assert counter.rate() == 0
+        assert counter.total == RATE_WINDOW - 1
+
+
+def test_key_stats_counts_changes() -> None:
+    """Test only updates with a different value count as changed."""
+    stats = KeyStats(100.0)
+    for now, value in ((100.0, 20.5), (101.0, 20.5), (102.0, 21.0), (103.0, 20.5)):
+        stats.record_update(now, value)
+
+    assert stats.received == 4
+    assert stats.changed == 2
+    assert stats.last_update == 103.0
+    assert stats.rate(104.0) == 1.0
+
+
+def test_hot_keys_sorted_by_rate() -> None:
+    """Test hot keys are the keys with the highest update rate."""
+    with patch("custom_components.harreither.stats.time") as mock_time:
+        mock_time.monotonic.return_value = 110.0
+        key_stats = {}
+        for key, updates in (((1, 2, None), 5), ((3, 2, None), 50), ((4, 2, None), 1)):
+            key_stats[key] = stats = KeyStats(100.0)
+            for _ in range(updates):
+                stats.record_update(105.0, 1)
+
+        assert [key for key, _, _ in hot_keys(key_stats, 2)] == [
+            (3, 2, None),
+            (1, 2, None),
+        ]
+
+
+def test_connection_stats_reconnects_and_phases() -> None:
+    """Test reconnect causes and phase durations are recorded."""
+    stats = ConnectionStats()
+    stats.record_reconnect(ConnectionError("socket closed"))
+    stats.record_reconnect(TimeoutError())
+    stats.record_reconnect(ConnectionError("reset"))
+    stats.record_phase("connect", 0.12345)
+    stats.add_phase("entity_creation", 0.5)
+    stats.add_phase("entity_creation", 0.25)
+
+    data = stats.as_dict()
+    assert data["reconnects"] == 3
+    assert data["reconnect_causes"] == {"ConnectionError": 2, "TimeoutError": 1}
+    assert data["last_reconnect_cause"] == "ConnectionError: reset"
+    assert data["phases"] == {"connect": 0.123, "entity_creation": 0.75}
@@ -0,0 +1,80 @@
+"""Update queue tests for the Harreither Integration."""
+
+import asyncio
+
+import pytest
+
+from custom_components.harreither.stats import LatencyHistogram
+from custom_components.harreither.updates import UpdateQueue
+
+
+async def _async_drain(queue: UpdateQueue, handler) -> LatencyHistogram:
+    """Run the dispatcher until the queue is idle, return its dispatch times."""
+    dispatch_time = LatencyHistogram()
+    runner = asyncio.create_task(queue.async_run(handler, dispatch_time))
+    await asyncio.wait_for(queue.async_wait_idle(), 1)
+    runner.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await runner
+    return dispatch_time
+
+
+async def test_updates_collapse_per_key() -> None:
+    """Test only the latest update per key is dispatched, keeping the new flag."""
+    queue = UpdateQueue()
+    queue.put((1, 2, None), {"value": 1}, True)
+    queue.put((3, 2, None), {"value": 5}, False)
+    queue.put((1, 2, None), {"value": 2}, False)
+    assert len(queue) == 2
+    assert queue.received == 3
+    assert queue.collapsed == 1
+    assert queue.max_depth == 2
+
+    dispatched = []
+
+    async def _handler(key, entry, new) -> None:
+        dispatched.append((key, entry["value"], new))
+
+    dispatch_time = await _async_drain(queue, _handler)
+
+    # Arrival order of the first update of each key
+    assert dispatched == [((1, 2, None), 2, True), ((3, 2, None), 5, False)]
+    assert queue.dispatched == 2
+    assert dispatch_time.count == 2
+    assert len(queue) == 0
+
+
+async def test_failing_handler_does_not_stop_dispatch(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test an exception in the handler is logged and the next update dispatched."""
+    queue = UpdateQueue()
+    queue.put((1, 2, None), {"value": 1}, False)
+    queue.put((3, 2, None), {"value": 5}, False)
+    dispatched = []
+
+    async def _handler(key, entry, new) -> None:
+        if key == (1, 2, None):
+            raise ValueError("broken entity")
+        dispatched.append(key)
+
+    await _async_drain(queue, _handler)
+
+    assert dispatched == [(3, 2, None)]
+    assert "Failed to dispatch update of (1, 2, None)" in caplog.text
+
+
+async def test_wait_idle_covers_updates_put_while_dispatching() -> None:
+    """Test idle is only reached once updates queued during dispatch are done."""
+    queue = UpdateQueue()
+    queue.put((1, 2, None), {"value": 1}, False)
+    dispatched = []
+
+    async def _handler(key, entry, new) -> None:
+        dispatched.append(key)
+        if key == (1, 2, None):
+            queue.put((3, 2, None), {"value": 5}, False)
+
+    await _async_drain(queue, _handler)
+
+    assert dispatched == [(1, 2, None), (3, 2, None)]